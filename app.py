@@ -2,24 +2,248 @@
 import streamlit as st
 from pathlib import Path
 import pandas as pd
+import numpy as np
 import altair as alt
 
-from src.models import Movie, MoviePlotter
+from src.models import Movie, MoviePlotter, HitThresholds, MetricsCube, runtime_labels
+from src.processing import read_metrics, build_title_index, find_movie, downsample, bin_2d, histogram
+from src.search import SearchIndex
+from src.people import PeopleIndex
+from src.sketch import QuantileSketch, sketches_by
+from src.cache import ResultCache
+from src.genres import genre_mask_of, match_genre
 
 data_path = Path("data/Movies_metrics.csv")
 
-@st.cache_data 
-def load_metrics():
+# Scatter plots: above this number of movies points are binned into a heatmap,
+# so the chart sent to the browser stays small (at most heatmap_bins² cells)
+scatter_max_points = 5_000
+heatmap_bins = 50
+
+# Number and total memory of the derived frames/charts kept in the shared result cache
+# (see the admin panel: ?admin=1)
+result_cache_size = 256
+result_cache_bytes = 256 * 2 ** 20
+
+def dataset_version():
+    """Version of the metrics file (last modification time): the cached objects below are
+    rebuilt only when it changes.
+    """
+    return data_path.stat().st_mtime_ns
+
+@st.cache_resource(max_entries=1)
+def load_metrics(version):
     """Loads the pre-computed metrics dataset used by the web app.
     The function is cached, meaning Streamlit won't reload it at every interaction (improved performance).
+    The typed Arrow copy is memory-mapped when available, so worker processes share the same
+    physical pages; `cache_resource` hands out that same frame instead of a private copy per session.
+    The frame is read-only: filters below always build new frames.
     Returns:
         pd.DataFrame: The dataset containing cleaned data and metrics.
     """
-    df = pd.read_csv(data_path)
+    df = read_metrics(data_path, memory_map=True)
     return df
 
-df = load_metrics()
-plotter = MoviePlotter(df)
+@st.cache_resource(max_entries=1)
+def load_title_index(version):
+    """Builds the title -> row positions index once, together with the cached dataset.
+    Returns:
+        dict: Normalized title -> row positions (see `build_title_index`).
+    """
+    return build_title_index(load_metrics(version))
+
+@st.cache_resource(max_entries=1)
+def load_title_search(version):
+    """Builds the prefix/fuzzy search index over titles once, together with the cached dataset.
+    Returns:
+        SearchIndex: Search index over the distinct titles.
+    """
+    return SearchIndex(load_metrics(version)["title"])
+
+@st.cache_resource(max_entries=1)
+def load_people(version):
+    """Builds the person-ID table and the director/star inverted indexes of the dataset.
+    Returns:
+        PeopleIndex: Person -> films, and per-person aggregates (computed once per role).
+    """
+    return PeopleIndex(load_metrics(version))
+
+@st.cache_resource(max_entries=1)
+def load_people_search(version):
+    """Builds the search index used to suggest director/star names.
+    Returns:
+        SearchIndex: Search index over the distinct names.
+    """
+    return SearchIndex(load_people(version).names)
+
+@st.cache_resource(max_entries=1)
+def load_thresholds(version):
+    """Loads the hit thresholds registry saved next to the metrics file.
+    A registry written for another version of the dataset (stale file) is recomputed
+    from the loaded dataset, so the app never uses cuts that do not match its `hit` column.
+    Returns:
+        HitThresholds | None: The registry, or None if the pipeline has not written it yet.
+    """
+    thresholds = HitThresholds.load(data_path)
+    if thresholds is not None and not thresholds.matches(load_metrics(version)):
+        thresholds = HitThresholds.from_frame(load_metrics(version), q=thresholds.q)
+    return thresholds
+
+@st.cache_resource(max_entries=1)
+def load_plotter(version):
+    """Builds the plotter of the movie summaries once per dataset version, so its
+    quantile sketches (ROI cap of the summary) are not rebuilt on every lookup.
+    Returns:
+        MoviePlotter: Plotter over the metrics dataset, with the hit thresholds.
+    """
+    return MoviePlotter(load_metrics(version), load_thresholds(version))
+
+@st.cache_resource(max_entries=1)
+def load_cube(version):
+    """Builds the aggregate cube (genre × hit × year × runtime bucket) used by the Global plots page.
+    Returns:
+        MetricsCube: Counts, sums and cross-products per cell.
+    """
+    return MetricsCube(load_metrics(version))
+
+@st.cache_resource(max_entries=1)
+def load_roi_sketches(version):
+    """Builds one ROI quantile sketch per (genre mask, hit) cell: the trimming bounds of any
+    filter state come from merging the selected cells instead of sorting the filtered rows.
+    Returns:
+        dict: (genre_mask, hit) -> QuantileSketch.
+    """
+    d = load_metrics(version)
+    cells = pd.DataFrame({"roi": d["roi"], "genre_mask": genre_mask_of(d), "hit": d["hit"]})
+    return sketches_by(cells, "roi", ["genre_mask", "hit"])
+
+@st.cache_resource
+def load_result_cache():
+    """Creates the result cache shared by all sessions (filtered frames, samples, chart specs).
+    Returns:
+        ResultCache: LRU cache keyed on (name, dataset version, genre, secondary genres,
+        only hits, n movies, metric).
+    """
+    return ResultCache(max_entries=result_cache_size, max_bytes=result_cache_bytes)
+
+def cached(name, compute, genre=None, only_hits=False, n_movies=None, metric=None):
+    """Result of `compute()` from the shared result cache, for the current dataset version
+    and genre matching mode (`secondary_genres`)."""
+    key = (name, version, genre, genre is not None and secondary_genres, only_hits, n_movies, metric)
+    return load_result_cache().get_or_compute(key, compute)
+
+def load_histogram(version, genre, only_hits, column, max_bins, trim=False, scale=1.0, secondary=False):
+    """Histogram of a column for a filter state (genre, secondary genres, only hits), binned server-side with NumPy:
+    only the bin edges and counts are sent to the browser. Called through `cached`, once per
+    (filter state, column).
+    With `trim` (ROI only) the values are trimmed to the 1–99% bounds from the ROI sketches.
+    Returns:
+        tuple[pd.DataFrame, tuple | None]: Bins (start, end, count) and the trimming bounds
+            (None without trimming, or when no value is left to trim).
+    """
+    d = load_metrics(version)
+    keep = np.ones(len(d), dtype=bool)
+    if genre is not None:
+        keep &= match_genre(genre_mask_of(d), genre, secondary)
+    if only_hits:
+        keep &= d["hit"].to_numpy(dtype=bool)
+    values = d[column].to_numpy(dtype="float64", na_value=np.nan)[keep] / scale
+    values = values[np.isfinite(values)]
+
+    bounds = None
+    if trim:
+        sketches = load_roi_sketches(version)
+        masks = np.array([g for g, _ in sketches], dtype=np.uint16)
+        hits = np.array([hit for _, hit in sketches], dtype=bool)
+        selected = (hits | (not only_hits)) & (match_genre(masks, genre, secondary) if genre is not None else True)
+        sketch = QuantileSketch.merged(s for s, keep_cell in zip(sketches.values(), selected) if keep_cell)
+        if sketch.n == 0 or len(values) == 0:
+            return pd.DataFrame({"start": [], "end": [], "count": []}), None
+        bounds = (sketch.quantile(0.01) / scale, sketch.quantile(0.99) / scale)
+        values = values[(values >= bounds[0]) & (values <= bounds[1])]
+
+    bins = 10 if len(values) < 50 else max_bins
+    return histogram(values, bins, bounds), bounds
+
+def histogram_chart(bins, title, domain=None):
+    """Bar chart of pre-computed bins (see `load_histogram`)."""
+    return alt.Chart(bins).mark_bar().properties(width=250, height=350).encode(
+        x=alt.X("start:Q", title=title, scale=alt.Scale(domain=list(domain)) if domain else alt.Undefined),
+        x2="end:Q",
+        y=alt.Y("count:Q", title="Count", axis=alt.Axis(tickMinStep=1)), #only integers
+        tooltip=["start:Q", "end:Q", "count:Q"]
+    )
+
+def filter_movies(d, genre, only_hits, secondary=False):
+    """Rows matching the sidebar filters (genre None = all genres; `secondary`: the genre
+    may be any genre of the movie, not only the main one). Uses the genre masks, no string work."""
+    if genre is not None:
+        d = d[match_genre(genre_mask_of(d), genre, secondary)]
+    if only_hits:
+        d = d[d["hit"] == True]
+    return d
+
+def money_chart(d_sample, log_money, as_heatmap):
+    """Budget vs Income scatter plot (heatmap above `scatter_max_points` movies)."""
+    d_money = d_sample.dropna(subset=["budget_num", "income_num"])
+    x_scale = alt.Scale(type="log") if log_money else alt.Undefined
+    y_scale = alt.Scale(type="log") if log_money else alt.Undefined
+
+    if as_heatmap:
+        cells = bin_2d(d_money, "budget_num", "income_num", bins=heatmap_bins, log=log_money)
+        return alt.Chart(cells).mark_rect().encode(
+            x=alt.X("x:Q", title="Budget", scale=x_scale), x2="x2:Q",
+            y=alt.Y("y:Q", title="Income", scale=y_scale), y2="y2:Q",
+            color=alt.Color("count:Q", scale=alt.Scale(scheme="greens"), legend=alt.Legend(title="Movies")),
+            tooltip=["count:Q"]
+        )
+
+    tooltip = ["title", "genre_main", "year", "budget_num", "income_num", "roi", "rating"]
+    d_money = d_money[[c for c in tooltip + ["hit"] if c in d_money.columns]]  # only charted fields
+    return alt.Chart(d_money).mark_circle(size=45, opacity=0.6).encode(
+        x=alt.X("budget_num:Q",title="Budget",scale=x_scale),
+        y=alt.Y("income_num:Q",title="Income",scale=y_scale),
+        color=alt.Color("hit:N", legend=alt.Legend(title="Hit")) if "hit" in d_money.columns else alt.value("#2E8B57"),
+        tooltip=["title:N", "genre_main:N", "year:Q", "budget_num:Q", "income_num:Q", "roi:Q", "rating:Q"]
+    ).interactive()
+
+def roi_rating_chart(d_sample, as_heatmap):
+    """ROI (trimmed 1–99%) vs Rating scatter plot, None if no movie has both values."""
+    d_roi_scatter = d_sample.dropna(subset=["roi", "rating"])
+    if len(d_roi_scatter) == 0:
+        return None
+
+    roi_low = float(d_roi_scatter["roi"].quantile(0.01))
+    roi_high = float(d_roi_scatter["roi"].quantile(0.99))
+
+    if as_heatmap:
+        cells = bin_2d(d_roi_scatter, "roi", "rating", bins=heatmap_bins, x_range=(roi_low, roi_high))
+        return alt.Chart(cells).mark_rect().encode(
+            x=alt.X("x:Q", title="ROI", scale=alt.Scale(domain=[roi_low, roi_high])), x2="x2:Q",
+            y=alt.Y("y:Q", title="Rating"), y2="y2:Q",
+            color=alt.Color("count:Q", scale=alt.Scale(scheme="greens"), legend=alt.Legend(title="Movies")),
+            tooltip=["count:Q"]
+        )
+
+    tooltip = ["title", "genre_main", "year", "roi", "rating"]
+    d_roi_scatter = d_roi_scatter[[c for c in tooltip if c in d_roi_scatter.columns]]  # only charted fields
+    return alt.Chart(d_roi_scatter).mark_circle(size=45, opacity=0.6).encode(
+        x=alt.X("roi:Q",title="ROI",scale=alt.Scale(domain=[roi_low, roi_high])),
+        y=alt.Y("rating:Q", title="Rating"),
+        color=alt.Color(
+            "genre_main:N",
+            legend=alt.Legend(title="Genre")
+        ) if "genre_main" in d_roi_scatter.columns else alt.value("#2E8B57"),
+        tooltip=["title:N", "genre_main:N", "year:Q", "roi:Q", "rating:Q"]
+    ).interactive()
+
+version = dataset_version()
+secondary_genres = False  # genre filter of the Global plots page: main genre only
+df = load_metrics(version)
+title_index = load_title_index(version)
+title_search = load_title_search(version)
+Movie.thresholds = load_thresholds(version) # same hit rule as the dataset `hit` column
+plotter = load_plotter(version)
 
 ###################### PAGE SETUP ######################
 st.title("🎬 Blockbuster Movie Analyzer")
@@ -31,6 +255,7 @@ st.markdown(
     - check whether a movie is classified as a **HIT** (based on ROI and rating)
     - test custom movies
     - explore some global visualizations
+    - look up the films and hit rate of a director or a star
     """
 )
 
@@ -40,7 +265,8 @@ options = {
     "Dataset overview": "📊 Dataset overview",
     "Check a movie": "🎬 Check a movie",
     "Custom movie simulator": "✨ Custom movie simulator",
-    "Global plots": "🌍 Global plots"
+    "Global plots": "🌍 Global plots",
+    "People": "🎭 Directors & stars"
 }
 
 clicked = st.sidebar.radio("",list(options.values()))
@@ -89,12 +315,24 @@ elif page == "Check a movie":
 
     if title_input:
     
-        match = df[df["title"].str.lower() == title_input.lower()]
+        match = find_movie(title_input, df, index=title_index)
 
-        if match.empty:
+        # no exact match: suggest similar titles (prefix + typo-tolerant)
+        if match is None:
+            suggestions = title_search.suggest(title_input, k=8)
+            if suggestions:
+                picked = st.selectbox("Did you mean:", suggestions)
+                match = find_movie(picked, df, index=title_index)
+
+        if match is None:
             st.error("❌ This movie is not in the dataset.")
         else:
             row = match.iloc[0]
+            # same title in different years: let the user choose
+            if len(match) > 1:
+                years = match["year"].tolist()
+                year = st.selectbox(f"{len(match)} movies with this title, choose the year:", years)
+                row = match.iloc[years.index(year)]
             movie = Movie.from_row(row)
 
             st.success(f"🎬 Found: **{movie.title}**")
@@ -107,6 +345,16 @@ elif page == "Check a movie":
             else:
                 st.warning("❌ This movie is **not** classified as a HIT.")
 
+            # same rule against the movies of its genre / decade only (per-genre and per-decade cuts)
+            if Movie.thresholds is not None:
+                peers = []
+                if pd.notna(row.get("genre_main")):
+                    peers.append((f"{row['genre_main']} movies", movie.is_hit(genre=row["genre_main"])))
+                if pd.notna(row.get("decade")):
+                    peers.append((f"movies of the {int(row['decade'])}s", movie.is_hit(decade=row["decade"])))
+                for group, hit in peers:
+                    st.write(f"Among {group}: {'🔥 **HIT**' if hit else 'not a hit'}")
+
             # graph
             st.markdown("**Visual summary (rating & ROI):**")
             fig, _ = plotter.plot_movie_summary(movie, show=False)
@@ -154,22 +402,24 @@ elif page == "Global plots":
 
     # Sidebar filters 
     st.sidebar.subheader("Filters for global plots")
-    d = df.copy()
+    cube = load_cube(version)  # trends, hit shares and correlations come from aggregates
+    selected_genre = "All genres"
 
     # 1) Genre filter
-    if "genre_main" in d.columns:
-        all_genres = ["All genres"] + sorted(d["genre_main"].dropna().unique().tolist())
+    if "genre_main" in df.columns:
+        all_genres = cached("genres", lambda: ["All genres"] + sorted(df["genre_main"].dropna().unique().tolist()))
         selected_genre = st.sidebar.selectbox("Genre", all_genres)
-
-        if selected_genre != "All genres":
-            d = d[d["genre_main"] == selected_genre]
+    cube_genre = None if selected_genre == "All genres" else selected_genre
+    if cube_genre is not None:
+        secondary_genres = st.sidebar.checkbox("Include movies where it is a secondary genre")
 
     # 2) Only hits
     only_hits = False
-    if "hit" in d.columns:
+    if "hit" in df.columns:
         only_hits = st.sidebar.checkbox("Show only hits")
-        if only_hits:
-            d = d[d["hit"] == True]
+
+    # Filtered rows, shared by all sessions with the same filters (no copy of the dataset)
+    d = cached("filtered", lambda: filter_movies(df, cube_genre, only_hits, secondary_genres), cube_genre, only_hits)
 
     # 3) Slider: how many movies to use (for scatter plots)
     max_n = len(d)
@@ -192,11 +442,13 @@ elif page == "Global plots":
             step=max(1, max_n // 10),
         )
 
-    # random sample (not necessarily first rows)
-    if len(d) > n_movies:
-        d_sample = d.sample(n=n_movies, random_state=0)
-    else:
-        d_sample = d
+    # random sample stratified by genre and hit (same mix as the filtered movies)
+    d_sample = cached("sample", lambda: downsample(d, n_movies, by=["genre_main", "hit"]),
+                      cube_genre, only_hits, n_movies)
+    as_heatmap = len(d_sample) > scatter_max_points
+
+    # Same filters on the aggregate cube
+    n_hits = int(cube.select(cube_genre, only_hits, secondary_genres)["n_hit"].sum())
 
     # 4) Log scale option for money
     log_money = st.sidebar.checkbox("Use log scale for Budget/Income")
@@ -215,14 +467,8 @@ elif page == "Global plots":
         with left:
             st.subheader("Budget vs Income")
             if {"budget_num", "income_num"}.issubset(d_sample.columns):
-                d_money = d_sample.dropna(subset=["budget_num", "income_num"]).copy()
-
-                chart = alt.Chart(d_money).mark_circle(size=45, opacity=0.6).encode(
-                    x=alt.X("budget_num:Q",title="Budget",scale=alt.Scale(type="log") if log_money else alt.Undefined),
-                    y=alt.Y("income_num:Q",title="Income",scale=alt.Scale(type="log") if log_money else alt.Undefined),
-                    color=alt.Color("hit:N", legend=alt.Legend(title="Hit")) if "hit" in d_money.columns else alt.value("#2E8B57"),
-                    tooltip=["title:N", "genre_main:N", "year:Q", "budget_num:Q", "income_num:Q", "roi:Q", "rating:Q"]
-                ).interactive()
+                chart = cached("money_chart", lambda: money_chart(d_sample, log_money, as_heatmap),
+                               cube_genre, only_hits, n_movies, metric="log" if log_money else "linear")
                 st.altair_chart(chart, use_container_width=True)
             else:
                 st.info("Columns 'budget_num'/'income_num' not available.")
@@ -231,22 +477,9 @@ elif page == "Global plots":
         with right:
             st.subheader("ROI vs Rating")
             if {"roi", "rating"}.issubset(d_sample.columns):
-                d_roi_scatter = d_sample.dropna(subset=["roi", "rating"]).copy()
-
-                if len(d_roi_scatter) > 0:
-                    roi_low = float(d_roi_scatter["roi"].quantile(0.01))
-                    roi_high = float(d_roi_scatter["roi"].quantile(0.99))
-
-                    chart = alt.Chart(d_roi_scatter).mark_circle(size=45, opacity=0.6).encode(
-                        x=alt.X("roi:Q",title="ROI",scale=alt.Scale(domain=[roi_low, roi_high])),
-                        y=alt.Y("rating:Q", title="Rating"),
-                        color=alt.Color(
-                            "genre_main:N",
-                            legend=alt.Legend(title="Genre")
-                        ) if "genre_main" in d_roi_scatter.columns else alt.value("#2E8B57"),
-                        tooltip=["title:N", "genre_main:N", "year:Q", "roi:Q", "rating:Q"]
-                    ).interactive()
-
+                chart = cached("roi_rating_chart", lambda: roi_rating_chart(d_sample, as_heatmap),
+                               cube_genre, only_hits, n_movies)
+                if chart is not None:
                     st.altair_chart(chart, use_container_width=True)
                 else:
                     st.info("No data available for ROI vs Rating with current filters.")
@@ -262,53 +495,33 @@ elif page == "Global plots":
             st.info("Not enough data to display distribution plots. Please broaden the filters.")
         else:
 
-            # ROI distribution 
+            # ROI distribution (trimmed 1–99%, no outliers)
             if "roi" in d.columns:
-                d_roi = d.dropna(subset=["roi"]).copy()
+                roi_bins, roi_bounds = cached("histogram", lambda: load_histogram(version, cube_genre, only_hits, "roi", 40, trim=True,
+                                                                                  secondary=secondary_genres),
+                                              cube_genre, only_hits, metric="roi")
 
-                if len(d_roi) > 0:
-                    roi_low = float(d_roi["roi"].quantile(0.01))
-                    roi_high = float(d_roi["roi"].quantile(0.99))
-
-                    d_roi = d_roi[(d_roi["roi"] >= roi_low) & (d_roi["roi"] <= roi_high)] # trimming  1–99% (no outliers)
-                    n_roi = len(d_roi)
-                    roi_bins = 10 if n_roi < 50 else 40
-                    
-                    roi_hist = alt.Chart(d_roi).mark_bar().properties(width=250, height=350).encode(
-                        x=alt.X("roi:Q", bin=alt.Bin(maxbins=roi_bins), title="ROI (trimmed 1–99%)", scale=alt.Scale(domain=[roi_low, roi_high])),
-                        y=alt.Y("count():Q", title="Count", axis=alt.Axis(tickMinStep=1)) #only integers
-                    )
+                if roi_bins["count"].sum() > 0:
                     left.subheader("ROI")
-                    left.altair_chart(roi_hist, use_container_width=False)
+                    left.altair_chart(histogram_chart(roi_bins, "ROI (trimmed 1–99%)", roi_bounds), use_container_width=False)
                 else:
                     left.info("No ROI values available with the current filters.")
 
             # Rating distribution
             if "rating" in d.columns:
-                d_rating = d.dropna(subset=["rating"])
-                n_rating = len(d_rating)
-                rating_bins = 10 if n_rating < 50 else 30
-                
-                rating_hist = alt.Chart(d_rating).mark_bar().properties(width=250, height=350).encode(
-                    x=alt.X("rating:Q", bin=alt.Bin(maxbins=rating_bins), title="Rating"),
-                    y=alt.Y("count():Q", title="Count", axis=alt.Axis(tickMinStep=1))
-                    )
+                rating_bins, _ = cached("histogram", lambda: load_histogram(version, cube_genre, only_hits, "rating", 30,
+                                                                            secondary=secondary_genres),
+                                        cube_genre, only_hits, metric="rating")
                 right.subheader("Rating")
-                right.altair_chart(rating_hist, use_container_width=False)
+                right.altair_chart(histogram_chart(rating_bins, "Rating"), use_container_width=False)
 
             # Profit distribution (in millions)
             if "profit" in d.columns:
-                d_prof = d.dropna(subset=["profit"]).copy()
-                d_prof["profit_million"] = d_prof["profit"] / 1e6
-                n_prof = len(d_prof)
-                prof_bins = 10 if n_prof < 50 else 40
-                
-                prof_hist = alt.Chart(d_prof).mark_bar().properties(width=250, height=350).encode(
-                    x=alt.X("profit_million:Q", bin=alt.Bin(maxbins=prof_bins), title="Profit ($M)"),
-                    y=alt.Y("count():Q", title="Count", axis=alt.Axis(tickMinStep=1))
-                    )
+                prof_bins, _ = cached("histogram", lambda: load_histogram(version, cube_genre, only_hits, "profit", 40, scale=1e6,
+                                                                          secondary=secondary_genres),
+                                      cube_genre, only_hits, metric="profit")
                 extra.subheader("Profit ($M)")
-                extra.altair_chart(prof_hist, use_container_width=False)
+                extra.altair_chart(histogram_chart(prof_bins, "Profit ($M)"), use_container_width=False)
 
     # TAB 3: Trends 
     with tab3:
@@ -323,18 +536,23 @@ elif page == "Global plots":
                 # aggregation rule
                 agg = "median" if metric in ["roi", "profit"] else "mean"
 
-                ts = (d.dropna(subset=["year", metric]).groupby("year")[metric]
-                     .agg(agg).reset_index().sort_values("year"))
+                def trend_chart():
+                    if agg == "mean":  # from the cube
+                        ts = cube.mean_by_year(metric, cube_genre, only_hits, secondary_genres)
+                    else:  # medians cannot be combined from aggregates: use the rows
+                        ts = (d.dropna(subset=["year", metric]).groupby("year")[metric]
+                             .agg(agg).reset_index().sort_values("year"))
 
-                line = alt.Chart(ts).mark_line(point=True).encode(
-                    x=alt.X("year:Q", title="Year", axis=alt.Axis(format="d")),
-                    y=alt.Y(f"{metric}:Q", title=f"{agg.capitalize()} {metric}"),
-                    tooltip=[
-                        alt.Tooltip("year:Q", format="d"),
-                        alt.Tooltip(f"{metric}:Q", format=".2f"),
-                    ],
-                ).interactive()
+                    return alt.Chart(ts).mark_line(point=True).encode(
+                        x=alt.X("year:Q", title="Year", axis=alt.Axis(format="d")),
+                        y=alt.Y(f"{metric}:Q", title=f"{agg.capitalize()} {metric}"),
+                        tooltip=[
+                            alt.Tooltip("year:Q", format="d"),
+                            alt.Tooltip(f"{metric}:Q", format=".2f"),
+                        ],
+                    ).interactive()
 
+                line = cached("trend_chart", trend_chart, cube_genre, only_hits, metric=metric)
                 st.altair_chart(line, use_container_width=True)
         else:
             st.info("Column 'year' not available.")
@@ -342,19 +560,20 @@ elif page == "Global plots":
         # Share of hits over time
         if {"year", "hit"}.issubset(d.columns):
             st.subheader("Share of hits over time")
-            d_year = d.dropna(subset=["year", "hit"]).copy()
             
             # Show plot only if enough data
-            if len(d_year) == 0 or d_year["hit"].sum() == 0:
+            if n_hits == 0:
                 st.info("No HITs available for this genre with the current filters.")
             else:
-                d_year = (d_year.groupby("year")["hit"].mean().mul(100).reset_index())
+                def hit_share_chart():
+                    d_year = cube.hit_share_by_year(cube_genre, only_hits, secondary_genres)
+                    return alt.Chart(d_year).mark_line(point=True).encode(
+                        x=alt.X("year:Q", title="Year", axis=alt.Axis(format="d")),
+                        y=alt.Y("hit:Q", title="Share of hits (%)"),
+                        tooltip=["year:Q", alt.Tooltip("hit:Q", format=".1f")]
+                    )
 
-                line = alt.Chart(d_year).mark_line(point=True).encode(
-                    x=alt.X("year:Q", title="Year", axis=alt.Axis(format="d")),
-                    y=alt.Y("hit:Q", title="Share of hits (%)"),
-                    tooltip=["year:Q", alt.Tooltip("hit:Q", format=".1f")]
-                )
+                line = cached("hit_share_chart", hit_share_chart, cube_genre, only_hits)
                 
                 st.altair_chart(line, use_container_width=True)
 
@@ -370,11 +589,11 @@ elif page == "Global plots":
         if len(corr_cols) < 2:
             st.info("Not enough numeric columns available to compute correlations.")
         else:
-            valid_corr_data = d[corr_cols].dropna()
-            if len(valid_corr_data) < 2:
+            corr_df, n_valid = cached("corr", lambda: cube.corr(cube_genre, only_hits, columns=corr_cols, secondary=secondary_genres),
+                                      cube_genre, only_hits)
+            if n_valid < 2:
                 st.info("Not enough data to compute correlations with the current filters.")
             else:
-                corr_df = valid_corr_data.corr()
                 # Convert correlation matrix to long format
                 corr_long = (corr_df.reset_index().melt(id_vars="index", var_name="variable2", value_name="corr")
                     .rename(columns={"index": "variable1"})
@@ -401,25 +620,17 @@ elif page == "Global plots":
         st.subheader("⏱ Hit share by runtime bucket")
         if {"runtime_min", "hit"}.issubset(d.columns):
 
-            # Create bucket
-            bins = [0, 90, 110, 130, 150, 1_000]
-            labels = ["<90", "90–110", "110–130", "130–150", "≥150"]
-            d_rt = d.dropna(subset=["runtime_min", "hit"]).copy()
-            
             # Show plot only if enough data
-            if len(d_rt) == 0 or d_rt["hit"].sum() == 0:
+            if n_hits == 0:
                 st.info("No HITs available for this genre with the current filters.")
             else:
-                d_rt["runtime_bucket"] = pd.cut(
-                    d_rt["runtime_min"], bins=bins, labels=labels, right=False, ordered=True
-                )
-
-                # Share of hit per bucket
-                share = (d_rt.groupby("runtime_bucket")["hit"].mean().mul(100).reset_index())
+                # Share of hit per bucket (from the cube)
+                share = cached("runtime_share", lambda: cube.hit_share_by_runtime(cube_genre, only_hits, secondary_genres),
+                               cube_genre, only_hits)
 
                 # Graph
                 chart = ( alt.Chart(share).mark_bar().properties(height=300).encode(
-                        x=alt.X("runtime_bucket:N", sort=labels, title="Runtime bucket"),
+                        x=alt.X("runtime_bucket:N", sort=runtime_labels, title="Runtime bucket"),
                         y=alt.Y("hit:Q", title="Hit share (%)"),
                         color=alt.Color("hit:Q", scale=alt.Scale(scheme="yellowgreenblue"), legend=None),
                         tooltip=["runtime_bucket:N", alt.Tooltip("hit:Q", format=".1f")])
@@ -429,4 +640,65 @@ elif page == "Global plots":
         else:
             st.info("Columns 'runtime_min' and 'HIT' not available.")
                     
+###################### People ######################
+elif page == "People":
+    st.header("🎭 Directors & stars")
+    people = load_people(version)
+    roles = {"Directors": "directors", "Stars": "stars"}
+    role = roles[st.radio("Role", list(roles), horizontal=True)]
+
+    # 1) One person: films and aggregates (inverted index, no scan of the credits)
+    name_input = st.text_input("Name of a director or a star:")
+    if name_input:
+        name = name_input
+        if people.person_id(name) is None:
+            suggestions = load_people_search(version).suggest(name_input, k=8)
+            name = st.selectbox("Did you mean:", suggestions) if suggestions else None
+
+        person = people.person_stats(name, role) if name else None
+        if name is None or people.person_id(name) is None:
+            st.error("❌ This person is not in the dataset.")
+        elif person is None:
+            st.info(f"{people.names[people.person_id(name)]} has no film as one of the {role} in the dataset.")
+        else:
+            st.success(f"🎬 **{person['name']}**: {int(person['films'])} films")
+            films_col, hits_col, roi_col, rating_col = st.columns(4)
+            films_col.metric("Films", int(person["films"]))
+            hits_col.metric("Hit share", f"{person['hit_share']:.0%}")
+            roi_col.metric("Median ROI", f"{person['median_roi']:.2f}×" if pd.notna(person["median_roi"]) else "–")
+            rating_col.metric("Mean rating", f"{person['mean_rating']:.1f}" if pd.notna(person["mean_rating"]) else "–")
+
+            columns = [c for c in ["title", "year", "genre_main", "rating", "roi", "hit"] if c in df.columns]
+            st.dataframe(people.films(name, role)[columns].sort_values("year", ascending=False),
+                         hide_index=True)
+
+    # 2) Ranking of the people of the role
+    st.markdown("---")
+    st.subheader("🏆 Ranking")
+    left, right = st.columns(2)
+    rankings = {"Hit share": "hit_share", "Median ROI": "median_roi", "Mean rating": "mean_rating", "Films": "films"}
+    by = rankings[left.selectbox("Rank by", list(rankings))]
+    min_films = right.slider("Minimum number of films", 1, 10, 3)
+    top = people.top(role, by=by, min_films=min_films, n=25)
+    if top.empty:
+        st.info("Nobody has that many films in the dataset.")
+    else:
+        st.dataframe(top.rename(columns={"name": "Name", "films": "Films", "hits": "Hits", "hit_share": "Hit share",
+                                         "mean_rating": "Mean rating", "median_roi": "Median ROI"}),
+                     hide_index=True)
+
+###################### ADMIN ######################
+# Shared result cache counters, to size `result_cache_size` / `result_cache_bytes` (open the app with ?admin=1)
+if st.query_params.get("admin") == "1":
+    stats = load_result_cache().stats()
+    with st.sidebar.expander("🛠️ Result cache (admin)", expanded=True):
+        st.write(f"Entries: {stats['entries']} / {stats['max_entries']}")
+        st.write(f"Memory: {stats['bytes'] / 2 ** 20:.1f} / {stats['max_bytes'] / 2 ** 20:.0f} MB")
+        hits_col, misses_col = st.columns(2)
+        hits_col.metric("Hits", stats["hits"])
+        misses_col.metric("Misses", stats["misses"])
+        st.write(f"Hit rate: {stats['hit_rate']:.1%} · Evictions: {stats['evictions']}")
+        if st.button("Clear cache"):
+            load_result_cache().clear()
+
 st.caption("Tip: use the filters in the sidebar and the log scale to explore money-related patterns.")
\ No newline at end of file
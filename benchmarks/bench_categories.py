@@ -0,0 +1,54 @@
+#BENCHMARK: memory footprint and groupby/filter time of the categorical text columns (object strings vs Categorical)
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.processing import category_vocabularies, clean
+
+N_ROWS = 1_000_000
+
+
+def best_of(func, repeat=3) -> float:
+    """Returns the best wall time (seconds) over `repeat` calls of `func`."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    raw = pd.read_csv("data/movies.csv")
+    df = raw.sample(n=N_ROWS, replace=True, random_state=0).reset_index(drop=True)
+    df["Title"] = df["Title"] + " #" + df.index.astype(str)  # distinct titles: no row is deduplicated
+
+    after = clean(df)
+    columns = [c for c in category_vocabularies if c in after.columns]
+    before = after.astype({c: object for c in columns})  # previous output of clean()
+
+    # memory report: df.memory_usage(deep=True) per column, in MB
+    usage = pd.DataFrame({"object (MB)": before.memory_usage(deep=True, index=False),
+                          "categorical (MB)": after.memory_usage(deep=True, index=False)}) / 2 ** 20
+    report = pd.concat([usage.loc[columns], usage.sum().rename("whole frame").to_frame().T])
+    report["ratio"] = report["object (MB)"] / report["categorical (MB)"]
+    print(f"{N_ROWS} rows, memory_usage(deep=True)")
+    print(report.round(2).to_string())
+
+    print()
+    genre = after["genre_main"].dropna().iloc[0]
+    tasks = {
+        "groupby(genre_main).rating.mean": lambda d: d.groupby("genre_main", observed=True)["rating"].mean(),
+        "filter genre_main == genre": lambda d: d[d["genre_main"] == genre],
+        "value_counts(certificate)": lambda d: d["certificate"].value_counts(),
+        "groupby(month, genre_main).size": lambda d: d.groupby(["month", "genre_main"], observed=True).size(),
+    }
+    for label, task in tasks.items():
+        t_before = best_of(lambda: task(before))
+        t_after = best_of(lambda: task(after))
+        print(f"{label:<36} | object: {t_before:.3f}s | categorical: {t_after:.3f}s | "
+              f"speedup: {t_before / t_after:.1f}x")
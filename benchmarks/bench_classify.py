@@ -0,0 +1,33 @@
+#BENCHMARK: hit classification (one Movie object per film vs Movie.classify on arrays)
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.models import Movie
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    n_rows = 1_000_000
+    budget = rng.choice([0.0, -1.0, 1e6, 5e6, 2e7, 1e8], size=n_rows)
+    income = rng.uniform(0, 3e8, size=n_rows)
+    rating = rng.uniform(1, 10, size=n_rows).round(1)
+
+    start = time.perf_counter()
+    movies = [Movie("x", b, i, r) for b, i, r in zip(budget.tolist(), income.tolist(), rating.tolist())]
+    loop_hit = np.array([bool(m.is_hit()) for m in movies])
+    loop_roi = np.array([np.nan if m.roi is None else m.roi for m in movies])
+    t_loop = time.perf_counter() - start
+
+    start = time.perf_counter()
+    batch = Movie.classify(budget, income, rating)
+    t_batch = time.perf_counter() - start
+
+    assert np.array_equal(loop_hit, batch["hit"].to_numpy()), "hit masks differ"
+    assert np.array_equal(loop_roi, batch["roi"].to_numpy(), equal_nan=True), "ROI differs"
+    print(f"{n_rows} movies | Movie loop: {t_loop:.3f}s | Movie.classify: {t_batch:.4f}s | "
+          f"speedup: {t_loop / t_batch:.0f}x")
@@ -0,0 +1,36 @@
+#BENCHMARK: clean() scaling with the number of processes (serial vs partitions in a process pool)
+import os
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.processing import clean
+
+N_ROWS = 2_000_000
+
+
+if __name__ == "__main__":
+    raw = pd.read_csv("data/movies.csv")
+    df = raw.sample(n=N_ROWS, replace=True, random_state=0).reset_index(drop=True)
+    # distinct titles, so the dedup keeps most rows as in a large real dataset
+    df["Title"] = df["Title"] + " #" + df.index.astype(str)
+
+    start = time.perf_counter()
+    serial = clean(df)
+    t_serial = time.perf_counter() - start
+    print(f"{N_ROWS} rows, {os.cpu_count()} CPUs")
+    print(f"{'serial':>10} | {t_serial:6.2f}s | {N_ROWS / t_serial / 1e6:5.2f}M rows/s")
+
+    workers = 2
+    while workers <= (os.cpu_count() or 1):
+        start = time.perf_counter()
+        parallel = clean(df, workers=workers)
+        t_parallel = time.perf_counter() - start
+        pd.testing.assert_frame_equal(serial, parallel, check_exact=True)
+        print(f"{workers:>2} workers | {t_parallel:6.2f}s | {N_ROWS / t_parallel / 1e6:5.2f}M rows/s | "
+              f"speedup: {t_serial / t_parallel:.1f}x")
+        workers *= 2
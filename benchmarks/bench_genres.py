@@ -0,0 +1,36 @@
+#BENCHMARK: genre normalization (per-row apply vs factorized mapping)
+import sys
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.processing import _map_genres_string, _pick_main, _map_genre_main
+
+
+def best_of(func, repeat=3) -> float:
+    """Returns the best wall time (seconds) over `repeat` calls of `func`."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    raw = pd.read_csv("data/movies.csv")["Genre"]
+
+    for n_rows in [10_000, 100_000, 1_000_000]:
+        genre = raw.sample(n=n_rows, replace=True, random_state=0).reset_index(drop=True)
+
+        old = genre.apply(lambda x: _pick_main(_map_genres_string(x)))
+        new = _map_genre_main(genre)
+        assert old.equals(new), "outputs differ"
+
+        t_old = best_of(lambda: genre.apply(lambda x: _pick_main(_map_genres_string(x))))
+        t_new = best_of(lambda: _map_genre_main(genre))
+        print(f"{n_rows:>9} rows | apply: {t_old:.3f}s | factorized: {t_new:.3f}s | "
+              f"speedup: {t_old / t_new:.1f}x")
@@ -0,0 +1,48 @@
+#BENCHMARK: cold-start import time (python -X importtime) of src.models and app.py
+# Each target runs in a fresh interpreter; the import time is the sum of the "self" column
+# of -X importtime. The plotting stack (matplotlib/seaborn) should only show up when a
+# matplotlib-based method runs.
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+N_RUNS = 5
+
+targets = {
+    "src.models (Movie)": "from src.models import Movie",
+    "src.models (MoviePlotter)": "from src.models import MoviePlotter",
+    "app.py (bare mode)": "import runpy; runpy.run_path('app.py')",
+    "matplotlib + seaborn (reference)": "import matplotlib.pyplot, seaborn",
+}
+
+
+def import_profile(code: str) -> tuple[float, float, set]:
+    """Runs `code` in a new interpreter.
+    Returns:
+        tuple: Wall time (s), total import time (s), names of the imported top-level packages.
+    """
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                          capture_output=True, text=True, env={"PYTHONPATH": str(ROOT), "PATH": ""})
+    wall = time.perf_counter() - start
+
+    total_us, packages = 0, set()
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, _, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        packages.add(name.strip().split(".")[0])
+    return wall, total_us / 1e6, packages
+
+
+if __name__ == "__main__":
+    print(f"best of {N_RUNS} cold starts")
+    for label, code in targets.items():
+        runs = [import_profile(code) for _ in range(N_RUNS)]
+        wall = min(r[0] for r in runs)
+        imports = min(r[1] for r in runs)
+        plotting = sorted({"matplotlib", "seaborn"} & runs[0][2]) or ["-"]
+        print(f"{label:<34} | wall: {wall:6.2f}s | imports: {imports:6.2f}s | plotting stack: {', '.join(plotting)}")
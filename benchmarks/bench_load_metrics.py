@@ -0,0 +1,36 @@
+#BENCHMARK: cold load of the metrics dataset (CSV + dtype inference vs typed Parquet)
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.processing import apply_schema, read_metrics, save_clean
+
+
+if __name__ == "__main__":
+    base = read_metrics("data/Movies_metrics.csv")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for n_rows in [2_000, 100_000, 1_000_000]:
+            df = base.sample(n=n_rows, replace=True, random_state=0).reset_index(drop=True)
+            path = Path(tmp) / f"metrics_{n_rows}.csv"
+            save_clean(df, path=str(path))
+
+            start = time.perf_counter()
+            apply_schema(pd.read_csv(path))
+            t_csv = time.perf_counter() - start
+
+            start = time.perf_counter()
+            read_metrics(path)
+            t_parquet = time.perf_counter() - start
+
+            start = time.perf_counter()
+            read_metrics(path, columns=["genre_main", "hit", "roi", "rating"])
+            t_cols = time.perf_counter() - start
+
+            print(f"{n_rows:>9} rows | csv: {t_csv:.3f}s | parquet: {t_parquet:.3f}s | "
+                  f"parquet (4 columns): {t_cols:.3f}s")
@@ -0,0 +1,63 @@
+#BENCHMARK: numeric parsing of clean() (astype(str) -> regex -> to_numeric chains vs parse_numbers,
+#           and each of its two strategies: per distinct value / vectorized Arrow kernels)
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.processing import parse_numbers, _parse_distinct, _parse_vectorized
+
+N_ROWS = 1_000_000
+
+# Previous chains of clean(), per format
+chains = {
+    "money": lambda s: pd.to_numeric(
+        s.astype(str).str.strip().replace({"Unknown": pd.NA}).str.replace(r"[^\d.]", "", regex=True),
+        errors="coerce"),
+    "thousands": lambda s: pd.to_numeric(s.astype(str).str.replace(",", "", regex=False), errors="coerce"),
+    "first_int": lambda s: pd.to_numeric(s.astype(str).str.extract(r"(\d+)")[0], errors="coerce"),
+}
+
+
+def best_of(func, repeat=3) -> float:
+    """Returns the best wall time (seconds) over `repeat` calls of `func`."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+if __name__ == "__main__":
+    raw = pd.read_csv("data/movies.csv")
+    rng = np.random.default_rng(0)
+
+    # Income/budget-like text with mostly distinct amounts, runtimes from the dataset
+    amounts = rng.integers(1_000, 3_000_000_000, N_ROWS)
+    money = pd.Series([f"${a:,}" for a in amounts], dtype=object)
+    money[rng.random(N_ROWS) < 0.05] = "Unknown"
+    columns = {
+        "money (mostly distinct)": (money, "money"),
+        "money (dataset values)": (raw["Budget"].sample(n=N_ROWS, replace=True, random_state=0)
+                                   .reset_index(drop=True), "money"),
+        "thousands": (pd.Series([f"{a:,}" for a in amounts], dtype=object), "thousands"),
+        "first_int (runtime)": (raw["Runtime"].sample(n=N_ROWS, replace=True, random_state=0)
+                                .reset_index(drop=True), "first_int"),
+    }
+
+    print(f"{N_ROWS} rows")
+    for label, (col, fmt) in columns.items():
+        pd.testing.assert_series_equal(parse_numbers(col, fmt), chains[fmt](col), check_names=False)
+
+        t_old = best_of(lambda: chains[fmt](col))
+        t_distinct = best_of(lambda: _parse_distinct(col, fmt))
+        t_vector = best_of(lambda: _parse_vectorized(col, fmt))
+        t_new = best_of(lambda: parse_numbers(col, fmt))
+        print(f"{label:<24} | chain: {N_ROWS / t_old / 1e6:5.2f}M rows/s | "
+              f"per distinct: {N_ROWS / t_distinct / 1e6:5.2f}M | vectorized: {N_ROWS / t_vector / 1e6:5.2f}M | "
+              f"parse_numbers: {N_ROWS / t_new / 1e6:5.2f}M rows/s | speedup: {t_old / t_new:.1f}x")
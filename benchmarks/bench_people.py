@@ -0,0 +1,62 @@
+#BENCHMARK: people-centric queries (str.contains scan vs PeopleIndex inverted index)
+import re
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.people import PeopleIndex
+from src.processing import read_metrics
+
+N_ROWS = 1_000_000
+N_QUERIES = 20
+
+
+def scan_stats(df, role, name) -> tuple[int, float, float, float]:
+    """Previous approach: full-table scan of the comma-joined strings."""
+    films = df[df[role].str.contains(rf"(?:^|,\s*){re.escape(name)}(?:\s*,|$)", na=False)]
+    return len(films), films["hit"].mean(), films["roi"].dropna().median(), films["rating"].mean()
+
+
+def index_stats(index, role, name) -> tuple[int, float, float, float]:
+    """Current approach: person -> rows from the inverted index."""
+    films = index.films(name, role)
+    return len(films), films["hit"].mean(), films["roi"].dropna().median(), films["rating"].mean()
+
+
+if __name__ == "__main__":
+    base = read_metrics("data/Movies_metrics.csv")
+    df = base.sample(n=N_ROWS, replace=True, random_state=0).reset_index(drop=True)
+    df = df.astype({"directors": object, "stars": object})
+
+    start = time.perf_counter()
+    index = PeopleIndex(df)
+    t_build = time.perf_counter() - start
+    n_credits = sum(index.n_credits.values())
+    print(f"{N_ROWS} rows, {n_credits} credits, {len(index)} people | build: {t_build:.2f}s")
+
+    start = time.perf_counter()
+    for role in index.roles:
+        index.stats(role)
+    print(f"aggregates of every person (all roles): {time.perf_counter() - start:.2f}s")
+
+    rng = np.random.default_rng(0)
+    for role in index.roles:
+        names = rng.choice(index.stats(role)["name"].to_numpy(), N_QUERIES)
+        start = time.perf_counter()
+        old = [scan_stats(df, role, n) for n in names]
+        t_scan = (time.perf_counter() - start) / N_QUERIES
+        start = time.perf_counter()
+        new = [index_stats(index, role, n) for n in names]
+        t_index = (time.perf_counter() - start) / N_QUERIES
+        start = time.perf_counter()
+        for n in names:
+            index.person_stats(n, role)
+        t_lookup = (time.perf_counter() - start) / N_QUERIES
+
+        assert all(a[0] == b[0] for a, b in zip(old, new)), "film counts differ"
+        print(f"{role:<9} per query | str.contains: {t_scan * 1e3:8.1f}ms | inverted index: {t_index * 1e3:6.2f}ms | "
+              f"precomputed aggregates: {t_lookup * 1e3:5.3f}ms | speedup: {t_scan / t_index:.0f}x")
@@ -0,0 +1,61 @@
+#BENCHMARK: 1–99% trimming of box_by_genre / roi_vs_rating (isin on the trimmed values vs boolean masks)
+import sys
+import time
+from pathlib import Path
+
+import matplotlib
+matplotlib.use("Agg")
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.models import MoviePlotter
+from src.processing import read_metrics
+
+N_ROWS = 1_000_000
+
+
+def trim_isin(plotter, columns, genre_col="genre_main"):
+    """Previous approach: drop missing values, then keep the rows whose value is in `trimmed()`."""
+    d = plotter.df[[genre_col, *columns]].dropna().copy()
+    for c in columns:
+        d = d[d[c].isin(plotter.trimmed(c))]
+    return d
+
+
+def trim_mask(plotter, columns, genre_col="genre_main"):
+    """Current approach: one comparison per column against the cached bounds."""
+    keep = plotter.df[genre_col].notna().to_numpy()
+    for c in columns:
+        keep = keep & plotter.trim_mask(c)
+    return plotter.df.loc[keep, [genre_col, *columns]]
+
+
+if __name__ == "__main__":
+    base = read_metrics("data/Movies_metrics.csv")
+    df = base.sample(n=N_ROWS, replace=True, random_state=0).reset_index(drop=True)
+    # spread the values so most of them are distinct, as in a large real dataset
+    df["roi"] = df["roi"] * (1 + 1e-9 * df.index.to_numpy())
+    df["rating"] = df["rating"] + 1e-9 * df.index.to_numpy()
+
+    plotter = MoviePlotter(df)
+    for c in ("roi", "rating", "profit"):
+        plotter.sketch(c)  # built once per dataset version, not part of the trimming cost
+
+    print(f"{N_ROWS} rows")
+    for label, columns in [("box_by_genre (profit)", ["profit"]), ("roi_vs_rating", ["roi", "rating"])]:
+        start = time.perf_counter()
+        old = trim_isin(plotter, columns)
+        t_isin = time.perf_counter() - start
+
+        plotter._trim_masks.clear()
+        start = time.perf_counter()
+        new = trim_mask(plotter, columns)
+        t_mask = time.perf_counter() - start
+
+        start = time.perf_counter()
+        trim_mask(plotter, columns)  # masks already computed for this dataset
+        t_reuse = time.perf_counter() - start
+
+        assert old.index.equals(new.index), "trimmed rows differ"
+        print(f"{label:<22} | isin: {t_isin:.3f}s | mask: {t_mask:.3f}s | "
+              f"mask (reused): {t_reuse:.3f}s | speedup: {t_isin / t_mask:.1f}x")
@@ -0,0 +1,71 @@
+#BENCHMARK: resident memory per worker process (private pandas copy vs memory-mapped Arrow)
+# Linux only: memory is read from /proc/self/smaps_rollup.
+# Rss counts every page a worker touches, Pss splits shared pages among the workers
+# mapping them, so Pss is what each worker really costs.
+import multiprocessing as mp
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+
+from src.processing import read_metrics, save_clean
+
+N_WORKERS = 4
+N_ROWS = 1_000_000
+
+
+def memory_mb() -> dict:
+    """Returns Rss and Pss (MB) of the current process."""
+    out = {}
+    for line in Path("/proc/self/smaps_rollup").read_text().splitlines():
+        key, *value = line.split()
+        if key in ("Rss:", "Pss:"):
+            out[key[:-1]] = int(value[0]) / 1024
+    return out
+
+
+def worker(path, memory_map, barrier, results):
+    before = memory_mb()
+    if memory_map:
+        df = read_metrics(path, memory_map=True)
+    else:
+        df = read_metrics(path)
+
+    # touch every column, as the app does when filtering and plotting
+    df.select_dtypes("number").sum()
+    df["title"].str.len().sum()
+
+    barrier.wait()  # every worker holds its dataset now
+    after = memory_mb()
+    results.append({k: after[k] - before[k] for k in after})
+    barrier.wait()
+
+
+def run_workers(path, memory_map) -> list[dict]:
+    ctx = mp.get_context("spawn")
+    with ctx.Manager() as manager:
+        barrier = manager.Barrier(N_WORKERS)
+        results = manager.list()
+        procs = [ctx.Process(target=worker, args=(path, memory_map, barrier, results))
+                 for _ in range(N_WORKERS)]
+        for p in procs:
+            p.start()
+        for p in procs:
+            p.join()
+        return list(results)
+
+
+if __name__ == "__main__":
+    base = read_metrics("data/Movies_metrics.csv")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "metrics.csv"
+        save_clean(base.sample(n=N_ROWS, replace=True, random_state=0), path=str(path))
+
+        print(f"{N_WORKERS} workers, {N_ROWS} rows (dataset memory added by each worker)")
+        for label, memory_map in [("private copy (parquet)", False), ("memory-mapped (arrow)", True)]:
+            res = run_workers(path, memory_map)
+            rss = sum(r["Rss"] for r in res) / len(res)
+            pss = sum(r["Pss"] for r in res) / len(res)
+            print(f"{label:<24} | Rss/worker: {rss:7.1f} MB | Pss/worker: {pss:7.1f} MB")
@@ -0,0 +1,103 @@
+#RESULT CACHE
+import sys
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+
+def result_size(value) -> int:
+    """Approximate memory (bytes) held by a cached result: frames and series are
+    measured with `memory_usage(deep=True)`, containers add up their items and
+    charts (e.g. Altair) the frame they embed."""
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(result_size(v) for v in value)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(result_size(v) for v in value.values())
+    data = getattr(value, "data", None)
+    if isinstance(data, pd.DataFrame):
+        return sys.getsizeof(value) + result_size(data)
+    return sys.getsizeof(value)
+
+
+# Class for a size-bounded cache of derived results (frames, chart specs)
+class ResultCache:
+    """A least-recently-used cache shared by every session of the web app.
+    Keys are tuples describing how a result was derived (e.g. dataset version, genre,
+    only hits, number of movies, metric), so entries of an old dataset version are
+    never hit again and are evicted first. Hit/miss counters help sizing the limits.
+    The cache is bounded by the memory of its results (`max_bytes`, see `result_size`)
+    as well as by their number: a filtered frame can be as large as the dataset.
+
+    Attributes:
+        max_entries (int): Maximum number of entries kept.
+        max_bytes (int | None): Maximum total size of the entries (None = no limit);
+            a single result larger than this is returned but not kept.
+        hits (int): Lookups answered from the cache.
+        misses (int): Lookups that had to compute the result.
+        evictions (int): Entries dropped to stay within the limits.
+    """
+    def __init__(self, max_entries: int = 256, max_bytes: int | None = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.n_bytes = 0
+        self._items = OrderedDict()  # key -> (value, size in bytes)
+        self._lock = threading.Lock()  # sessions run in separate threads
+
+    # Cached result for `key`, computed with `compute()` on a miss
+    def get_or_compute(self, key, compute):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key][0]
+            self.misses += 1
+
+        value = compute()  # outside the lock: other sessions are not blocked meanwhile
+        size = result_size(value) if self.max_bytes is not None else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            return value
+        with self._lock:
+            if key in self._items:  # computed meanwhile by another session
+                self.n_bytes -= self._items.pop(key)[1]
+            self._items[key] = (value, size)
+            self.n_bytes += size
+            while len(self._items) > self.max_entries or \
+                    (self.max_bytes is not None and self.n_bytes > self.max_bytes):
+                self.n_bytes -= self._items.popitem(last=False)[1][1]
+                self.evictions += 1
+        return value
+
+    # Drop every entry (counters are kept)
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+            self.n_bytes = 0
+
+    # Counters for the admin panel
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._items),
+                "max_entries": self.max_entries,
+                "bytes": self.n_bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self):
+        return len(self._items)
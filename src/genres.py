@@ -0,0 +1,102 @@
+#GENRES
+import numpy as np
+import pandas as pd
+
+# Canonical genres; genre i is bit i of a genre mask (12 genres fit in a uint16)
+canon_genres = [
+    "Action","Adventure","Animation","Comedy","Crime","Drama",
+    "Fantasy","Horror","Mystery","Romance","Sci-Fi","Thriller"
+]
+
+genre_bits = {g: 1 << i for i, g in enumerate(canon_genres)}
+
+
+def genres_to_mask(genres) -> int:
+    """Bitmask of a genre or a list of canonical genres (e.g. ["Horror", "Comedy"]).
+    Raises:
+        ValueError: If a genre is not one of `canon_genres`.
+    """
+    if isinstance(genres, str):
+        genres = [genres]
+    unknown = [g for g in genres if g not in genre_bits]
+    if unknown:
+        raise ValueError(f"Unknown genre(s): {', '.join(unknown)}")
+    return sum(genre_bits[g] for g in set(genres))
+
+
+def mask_to_genres(mask: int) -> list[str]:
+    """Canonical genres of one mask, in `canon_genres` order."""
+    return [g for g, bit in genre_bits.items() if int(mask) & bit]
+
+
+def has_any_genre(masks, genres) -> np.ndarray:
+    """Rows whose genres include at least one of `genres`.
+    Args:
+        masks (array-like): Genre masks (e.g. the `genre_mask` column).
+        genres (str | list[str]): Canonical genre(s).
+    Returns:
+        np.ndarray: Boolean array, one value per row.
+    """
+    return (np.asarray(masks, dtype=np.uint16) & genres_to_mask(genres)) != 0
+
+
+def has_all_genres(masks, genres) -> np.ndarray:
+    """Rows whose genres include every one of `genres` (e.g. Horror and Comedy).
+    Args:
+        masks (array-like): Genre masks (e.g. the `genre_mask` column).
+        genres (str | list[str]): Canonical genre(s).
+    Returns:
+        np.ndarray: Boolean array, one value per row.
+    """
+    wanted = genres_to_mask(genres)
+    return (np.asarray(masks, dtype=np.uint16) & wanted) == wanted
+
+
+def main_genre_mask(masks) -> np.ndarray:
+    """Bit of the main genre of each row (the first canonical one, i.e. the lowest
+    set bit, as `genre_main`); 0 when the row has no canonical genre."""
+    masks = np.asarray(masks, dtype=np.uint16)
+    return masks & (~masks + np.uint16(1))
+
+
+def match_genre(masks, genre: str, secondary: bool = False) -> np.ndarray:
+    """Rows of a genre filter: `genre` is the main genre of the row, or, with
+    `secondary`, any of its genres.
+    Args:
+        masks (array-like): Genre masks.
+        genre (str): Canonical genre.
+        secondary (bool): Whether rows where `genre` is not the main genre match too.
+    Returns:
+        np.ndarray: Boolean array, one value per row.
+    """
+    if secondary:
+        return has_any_genre(masks, genre)
+    return main_genre_mask(masks) == genres_to_mask(genre)
+
+
+def explode_genres(masks) -> tuple[np.ndarray, np.ndarray]:
+    """One (row, genre) pair per genre of each row, without string work.
+    Args:
+        masks (array-like): Genre masks.
+    Returns:
+        tuple[np.ndarray, np.ndarray]: Row positions and genre positions in `canon_genres`
+        (rows in order, genres in `canon_genres` order within a row).
+    """
+    masks = np.asarray(masks, dtype=np.uint16)
+    bits = (masks[:, None] >> np.arange(len(canon_genres), dtype=np.uint16)) & 1
+    return np.nonzero(bits)
+
+
+def genre_counts(masks) -> pd.Series:
+    """Number of rows per canonical genre (a row counts once for each of its genres)."""
+    _, genres = explode_genres(masks)
+    return pd.Series(np.bincount(genres, minlength=len(canon_genres)), index=canon_genres, name="count")
+
+
+def genre_mask_of(df: pd.DataFrame) -> np.ndarray:
+    """Genre masks of a dataset: the `genre_mask` column, or, for files written before
+    it existed, the bit of `genre_main` only."""
+    if "genre_mask" in df.columns:
+        return df["genre_mask"].to_numpy(dtype=np.uint16)
+    bits = df["genre_main"].astype(object).map(genre_bits)
+    return bits.fillna(0).to_numpy(dtype=np.uint16)
@@ -1,167 +1,188 @@
 #MAIN
-import pandas as pd
+import argparse
+import os
 import sys
 from pathlib import Path
-from matplotlib import pyplot as plt
 
 sys.path.append(str(Path(__file__).resolve().parents[1]))
 
 # Import functions and classes
-from src.processing import run, find_movie, ask_float, add_metrics, save_fig
+from src.processing import run, find_movie, ask_float, compute_metrics, save_metrics, apply_schema
+from src.processing import build_title_index, render_figures, figure_specs, output_dir
 from src.models import Movie, MoviePlotter
-
-
-raw_path  = Path("data/movies.csv")
-clean_path = Path("data/movies_clean.csv")
-
-df_raw = None
-df = None
-if __name__ == "__main__":
-    df_raw, df = run()
-
-
-# Definition on financial metrics
-df = add_metrics(df)
-
-# Summary of main statistics after cleaning procedure
-summary = {
-    "Rows": df.shape[0],
-    "Columns": df.shape[1],
-    "Mean Rating": round(df["rating"].mean(skipna=True), 2),
-    "Median ROI": round(df["roi"].median(skipna=True), 2),
-    "Mean Profit ($M)": round(df["profit"].mean(skipna=True) / 1e6, 2),
-    "Share of Hits (%)": round(100 * df["hit"].mean(), 1),
-    "Hit threshold (Rating)": round(df["rating"].quantile(0.75), 2),
-    "Hit threshold (ROI)": round(df["roi"].quantile(0.75), 2),
-    "Hit threshold (Profit $M)": round(df["profit"].quantile(0.75) / 1e6, 2)
-}
-
-print("\n Cleaned and enriched dataset summary:")
-for k, v in summary.items():
-    print(f"{k}: {v}")
-
-
-########
-# Load the cleaned and enriched dataset
-df_metrics = pd.read_csv("data/Movies_metrics.csv")
-
-# Check if a movie in the dataset is a "hit"
-print("\n🎬 Welcome! Check if a movie is a hit!")
-print("Type a movie title to check it, or 'exit' to quit.\n")
-
-plotter = MoviePlotter(df_metrics) # initialize the plotter
-
-is_found = False # initialize control variable
-
-# Loop until a valid movie title is found or ask whether to write another title or quit
-while not is_found:
+from src.profiling import Profiler, stage
+from src.search import SearchIndex
+
+
+# "summarize" function: main statistics after the cleaning procedure
+def summarize(df, thresholds) -> dict:
+    summary = {
+        "Rows": df.shape[0],
+        "Columns": df.shape[1],
+        "Mean Rating": round(df["rating"].mean(skipna=True), 2),
+        "Median ROI": round(df["roi"].median(skipna=True), 2),
+        "Mean Profit ($M)": round(df["profit"].mean(skipna=True) / 1e6, 2),
+        "Share of Hits (%)": round(100 * df["hit"].mean(), 1),
+        "Hit threshold (Rating)": round(thresholds.cuts()[0], 2),
+        "Hit threshold (ROI)": round(thresholds.cuts()[1], 2),
+        "Hit threshold (Profit $M)": round(df["profit"].quantile(0.75) / 1e6, 2)
+    }
+
+    print("\n Cleaned and enriched dataset summary:")
+    for k, v in summary.items():
+        print(f"{k}: {v}")
+    return summary
+
+
+# "check_movie" function: interactive check of a movie (in the dataset or not)
+def check_movie(df_metrics, thresholds) -> None:
+    from matplotlib import pyplot as plt
+
+    # Check if a movie in the dataset is a "hit"
+    print("\n🎬 Welcome! Check if a movie is a hit!")
+    print("Type a movie title to check it, or 'exit' to quit.\n")
+
+    plotter = MoviePlotter(df_metrics, thresholds) # initialize the plotter
+    title_index = build_title_index(df_metrics) # title -> rows, built once for all lookups
+    title_search = SearchIndex(df_metrics["title"]) # prefix/fuzzy suggestions
+
+    is_found = False # initialize control variable
+
+    # Loop until a valid movie title is found or ask whether to write another title or quit
+    while not is_found:
     
-    user_input = input("Enter a movie title: ").strip() # ask the user for a movie title
+        user_input = input("Enter a movie title: ").strip() # ask the user for a movie title
     
-    if user_input.lower() == "exit": # allow exit
-        print("Goodbye!")
-        break
+        if user_input.lower() == "exit": # allow exit
+            print("Goodbye!")
+            break
     
-    match = find_movie(user_input, df_metrics) # search for the movie in the dataset
+        match = find_movie(user_input, df_metrics, index=title_index) # search for the movie in the dataset
+
+        if match is None: # suggest similar titles
+            suggestions = title_search.suggest(user_input, k=5)
+            if suggestions:
+                print("Did you mean:")
+                for i, s in enumerate(suggestions, start=1):
+                    print(f"  {i}. {s}")
+                pick = input("Type the number of the movie (or press Enter to skip): ").strip()
+                if pick.isdigit() and 1 <= int(pick) <= len(suggestions):
+                    match = find_movie(suggestions[int(pick) - 1], df_metrics, index=title_index)
     
-    if match is None: # if not found
-        print("❌ This movie is not in the dataset.")
+        if match is None: # if not found
+            print("❌ This movie is not in the dataset.")
 
-        # Ask to insert data manually
-        choice = input("Do you want to enter budget, income, and rating manually? (yes/no): ").strip().lower()
-        if choice != "yes":
-            print("Try another title.")
-            continue
+            # Ask to insert data manually
+            choice = input("Do you want to enter budget, income, and rating manually? (yes/no): ").strip().lower()
+            if choice != "yes":
+                print("Try another title.")
+                continue
 
-        budget = ask_float("Budget (USD): ")
-        income = ask_float("Income (USD): ")
+            budget = ask_float("Budget (USD): ")
+            income = ask_float("Income (USD): ")
         
-        while True: # rating 0–10
-            try:
-                rating = float(input("Rating (0-10): ").strip())
-                if 0 <= rating <= 10:
-                    break
-                else:
-                    print("Rating must be between 0 and 10")
-            except ValueError:
-                print("Please enter a valid number")
-
-        movie = Movie(title=user_input, budget=budget, income=income, rating=rating) # create the movie
-        print(f"\n✅ Movie: {movie.title}")
-        movie.describe()
+            while True: # rating 0–10
+                try:
+                    rating = float(input("Rating (0-10): ").strip())
+                    if 0 <= rating <= 10:
+                        break
+                    else:
+                        print("Rating must be between 0 and 10")
+                except ValueError:
+                    print("Please enter a valid number")
+
+            movie = Movie(title=user_input, budget=budget, income=income, rating=rating) # create the movie
+            print(f"\n✅ Movie: {movie.title}")
+            movie.describe()
             
-        if movie.is_hit(): # check if it’s a hit
-            feedback = "Yes! This movie is a HIT!"
-        else:
-            feedback = "This movie is not quite a HIT..."
+            if movie.is_hit(): # check if it’s a hit
+                feedback = "Yes! This movie is a HIT!"
+            else:
+                feedback = "This movie is not quite a HIT..."
         
-        print(feedback)
+            print(feedback)
 
-        # graphic summary
-        plotter.plot_movie_summary(movie, show=True, block=False)
-        plt.pause(0.1)
+            # graphic summary
+            plotter.plot_movie_summary(movie, show=True, block=False)
+            plt.pause(0.1)
         
-        is_found = True
-        continue
+            is_found = True
+            continue
     
-    row = match.iloc[0] # if found
-    movie = Movie.from_row(row) # Movie object 
-    print(f"\n✅ Found: {movie.title}")
-    movie.describe()
+        row = match.iloc[0] # if found
+        movie = Movie.from_row(row) # Movie object 
+        print(f"\n✅ Found: {movie.title}")
+        movie.describe()
     
-    if movie.is_hit(): # check if it’s a hit
-        feedback = "Yes! This movie is a HIT!"
-    else:
-        feedback = "This movie is not quite a HIT..."
+        if movie.is_hit(): # check if it’s a hit
+            feedback = "Yes! This movie is a HIT!"
+        else:
+            feedback = "This movie is not quite a HIT..."
     
-    print(feedback)
+        print(feedback)
     
-    # graphic summary
-    plotter.plot_movie_summary(movie, show=True, block=False)
-    plt.pause(0.1) 
+        # graphic summary
+        plotter.plot_movie_summary(movie, show=True, block=False)
+        plt.pause(0.1) 
     
-    is_found = True # end loop
-
-print("\n[info] Interactive loop finished. Starting plots...")
-
-
-########## Plots
+        is_found = True # end loop
+
+
+# "main" function: clean -> metrics -> analysis -> plots, frames passed in memory
+def main(persist: bool = True, interactive: bool = True, plots: bool = True,
+         plot_workers: int | None = None, clean_workers: int | None = None):
+    # 1. Cleaning (raw -> data/movies_clean.csv)
+    df_raw, df = run(save=persist, workers=clean_workers)
+
+    # 2. Definition of financial metrics (-> data/Movies_metrics.csv + hit thresholds)
+    df, thresholds = compute_metrics(df)
+    if persist:
+        save_metrics(df, thresholds)
+    df = apply_schema(df.reset_index(drop=True)) # same frame read_metrics() returns for the saved file
+    Movie.thresholds = thresholds # Movie.is_hit() uses the same rule as the `hit` column
+
+    # 3. Analysis
+    with stage("summary", rows=len(df)):
+        summarize(df, thresholds)
+    if interactive:
+        check_movie(df, thresholds)
+        print("\n[info] Interactive loop finished. Starting plots...")
+
+    # 4. Plots (-> outputs/figures)
+    # 1. Distributions (rating, ROI, profit)
+    # 2. Economic relationship (budget vs income)
+    # 3. Genre analysis (boxplots, ROI vs rating)
+    # 4. Correlations
+    # 5. Trends over time
+    # 6. Film duration
+    if plots:
+        timings = render_figures(df, figure_specs, workers=plot_workers, thresholds=thresholds)
+        rendered = sum(seconds is not None for seconds in timings.values())
+        print(f"[info] {rendered} figures rendered, {len(timings) - rendered} already up to date, in {output_dir}")
+    return df, thresholds
 
-# 1. Distributions
-fig, _ = plotter.dist("rating", show=False)
-save_fig(fig, "dist_rating")
 
-fig, _ = plotter.dist("roi", show=False)
-save_fig(fig, "dist_roi")
-
-fig, _ = plotter.dist("profit", show=False)
-save_fig(fig, "dist_profit")
-
-# 2. Economic relationship
-fig, _ = plotter.scatter("budget_num", "income_num", log=True, show=False)
-save_fig(fig, "scatter_budget_income")
-
-# 3. Genre analysis
-fig, _ = plotter.box_by_genre("roi", show=False)
-save_fig(fig, "boxplot_roi_by_genre")
-
-fig, _ = plotter.box_by_genre("rating", show=False)
-save_fig(fig, "boxplot_rating_by_genre")
-
-fig, _ = plotter.box_by_genre("runtime_min", show=False)
-save_fig(fig, "boxplot_runtime_by_genre")
-
-fig, _ = plotter.roi_vs_rating(show=False)
-save_fig(fig, "roi_vs_rating")
-
-# 4. Correlations
-fig, _ = plotter.corr_heatmap(show=False)
-save_fig(fig, "correlation_heatmap")
-
-# 5. Trends over time
-fig, _ = plotter.hit_trend_over_time(show=False)
-save_fig(fig, "hit_trend_over_time")
-
-# 6. Film duration
-fig, _ = plotter.hit_by_runtime_bucket(show=False)
-save_fig(fig, "hit_by_runtime_bucket")
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cleaning, metrics, analysis and plots of the movie dataset.")
+    parser.add_argument("--no-save", action="store_true", help="do not write the cleaned/enriched datasets")
+    parser.add_argument("--no-interactive", action="store_true", help="skip the interactive movie check")
+    parser.add_argument("--no-plots", action="store_true", help="skip the figures")
+    parser.add_argument("--profile", action="store_true",
+                        help="write a JSON report (time, rows/s, peak memory per stage) to outputs/profiles")
+    parser.add_argument("--cprofile", metavar="STAGE",
+                        help="also dump a cProfile of one stage (e.g. clean, compute_metrics, render_figures)")
+    args = parser.parse_args()
+
+    # Independent figures are rendered in a process pool; set PLOT_WORKERS to choose
+    # the number of processes (default: one per CPU, 1 = serial).
+    # Large raw files are cleaned in a process pool too; set CLEAN_WORKERS likewise
+    # (small files are always cleaned serially).
+    options = dict(persist=not args.no_save, interactive=not args.no_interactive, plots=not args.no_plots,
+                   plot_workers=int(os.environ.get("PLOT_WORKERS", 0)) or None,
+                   clean_workers=int(os.environ.get("CLEAN_WORKERS", 0)) or None)
+    if args.profile or args.cprofile:
+        with Profiler(cprofile=args.cprofile) as profiler:
+            main(**options)
+        print(f"[info] Profiling report saved to {profiler.save()}")
+    else:
+        main(**options)
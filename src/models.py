@@ -1,8 +1,22 @@
 #CLASS OBJECTS
-import matplotlib.pyplot as plt
-import seaborn as sns
 import pandas as pd
 import numpy as np
+import json
+import hashlib
+import inspect
+from pathlib import Path
+
+from src.sketch import QuantileSketch
+from src.genres import canon_genres, explode_genres, genre_mask_of, match_genre
+from src.profiling import timed
+
+# Rows of the dataset drawn by a MoviePlotter method (profiling)
+def _plot_rows(self, *args, **kwargs) -> int:
+    return len(self.df)
+
+# Standard runtime buckets (minutes)
+runtime_bins = [0, 90, 110, 130, 150, 1_000]
+runtime_labels = ["<90", "90–110", "110–130", "130–150", "≥150"]
 
 #Class for plots 
 class MoviePlotter:
@@ -19,13 +33,44 @@ class MoviePlotter:
 
     Attributes:
         df (pd.DataFrame): The movie dataset.
+        thresholds (HitThresholds | None): Hit thresholds of the dataset.
+        sketch_k (int): Size of the quantile sketches used for trimming.
         palette (dict): Custom color palette for consistent plot styling.
     """
-    def __init__(self, df):
+    # Theme and style overrides (also part of the render cache key)
+    theme = {"style": "whitegrid", "context": "talk"}
+    rc_style = {
+        "axes.edgecolor": "#444444",
+        "axes.labelcolor": "#333333",
+        "xtick.color": "#444444",
+        "ytick.color": "#444444",
+        "axes.facecolor": "#fafafa",
+        "figure.facecolor": "#ffffff",
+        "grid.alpha": 0.3,
+        "grid.color": "#cccccc",
+        "font.size": 12,
+        "axes.titlesize": 14,
+    }
+
+    # Columns read by each plotting method, from its bound arguments (render cache key)
+    figure_inputs = {
+        "dist": lambda a: [a["column"]],
+        "scatter": lambda a: [a["x"], a["y"]],
+        "box_by_genre": lambda a: [a["genre_col"], a["column"]],
+        "roi_vs_rating": lambda a: [a["genre_col"], "roi", "rating"],
+        "corr_heatmap": lambda a: ["budget_num", "income_num", "profit", "roi", "rating", "runtime_min"],
+        "hit_trend_over_time": lambda a: [a["year_col"], a["hit_col"]],
+        "hit_by_runtime_bucket": lambda a: [a["runtime_col"], a["hit_col"]],
+    }
+
+    def __init__(self, df, thresholds=None, sketch_k=4096):
         self.df = df
-
-        # Theme
-        sns.set_theme(style="whitegrid", context="talk")
+        self.thresholds = thresholds
+        self.sketch_k = sketch_k
+        self._column_hashes = {}
+        self._sketches = {}
+        self._trim_masks = {}
+        self._styled = False
 
         # Palette (green)
         self.palette = {
@@ -36,35 +81,70 @@ class MoviePlotter:
             "neutral": "#E6EAE9" 
         }
 
-        plt.rcParams.update({
-            "axes.edgecolor": "#444444",
-            "axes.labelcolor": "#333333",
-            "xtick.color": "#444444",
-            "ytick.color": "#444444",
-            "axes.facecolor": "#fafafa",
-            "figure.facecolor": "#ffffff",
-            "grid.alpha": 0.3,
-            "grid.color": "#cccccc",
-            "font.size": 12,
-            "axes.titlesize": 14,
-        })
+    # Plotting stack, imported (and themed) when the first figure is drawn:
+    # Movie, HitThresholds and the cache keys do not need matplotlib/seaborn
+    def _plotting(self):
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        if not self._styled:
+            sns.set_theme(**self.theme)
+            plt.rcParams.update(self.rc_style)
+            self._styled = True
+        return plt, sns
+
+    # Key identifying a figure: method, its arguments, the input data, the style and the plotter settings
+    def render_key(self, method, *args, **kwargs):
+        params = inspect.signature(getattr(self, method)).bind(*args, **kwargs)
+        params.apply_defaults()
+        params = {k: v for k, v in params.arguments.items() if k not in ("show", "block")}
+
+        inputs = self.figure_inputs.get(method, lambda a: list(self.df.columns))(params)
+        digest = hashlib.sha256()
+        # plotter settings too: the sketch size sets the trimming bounds, the thresholds the hit rule
+        cuts = self.thresholds.cuts() if self.thresholds is not None else None
+        digest.update(repr((method, sorted(params.items()), self.theme, sorted(self.rc_style.items()),
+                            sorted(self.palette.items()), self.sketch_k, cuts)).encode())
+        for col in sorted(c for c in inputs if c in self.df.columns):
+            if col not in self._column_hashes:
+                hashed = pd.util.hash_pandas_object(self.df[col], index=True).to_numpy()
+                self._column_hashes[col] = hashlib.sha256(hashed.tobytes()).hexdigest()
+            digest.update(f"{col}:{self._column_hashes[col]}".encode())
+        return digest.hexdigest()
     
     #Palette for categorical series
     def _cat_palette(self, series, cmap="crest"):
+        _, sns = self._plotting()
         levels = list(pd.Series(series).dropna().unique())
         colors = sns.color_palette(cmap, n_colors=len(levels))
         pal = dict(zip(levels, colors))
         return pal, levels
  
+    # Quantile sketch of a column (built once per column for this dataset)
+    def sketch(self, column):
+        if column not in self._sketches:
+            self._sketches[column] = QuantileSketch.from_values(self.df[column], k=self.sketch_k)
+        return self._sketches[column]
+
+    # Trimming bounds of a column (1st and 99th percentile)
+    def trim_bounds(self, column):
+        return self.sketch(column).quantile(0.01), self.sketch(column).quantile(0.99)
+
+    # Rows of the dataset inside the trimming bounds of a column (missing values excluded)
+    def trim_mask(self, column):
+        if column not in self._trim_masks:
+            lower, upper = self.trim_bounds(column)
+            values = self.df[column].to_numpy(dtype="float64", na_value=np.nan)
+            self._trim_masks[column] = (values >= lower) & (values <= upper)
+        return self._trim_masks[column]
+
     # Trimming data to remove extreme outliers (0–99th percentile)
     def trimmed(self, column):
-        data = self.df[column].dropna()
-        lower = data.quantile(0.01)
-        upper = data.quantile(0.99)
-        return data[(data >= lower) & (data <= upper)]
+        return self.df[column][self.trim_mask(column)]
 
     # 1. Distribution of a single variable
+    @timed(rows=_plot_rows)
     def dist(self, column, show=True):
+        plt, sns = self._plotting()
         filtered = self.trimmed(column)
         fig, ax = plt.subplots(figsize=(7, 5))
         sns.histplot(filtered, kde=True, bins=40, color=self.palette["light"], ax=ax)
@@ -76,7 +156,9 @@ class MoviePlotter:
         return fig, ax
 
     # Scatter plot between 2 variables
+    @timed(rows=_plot_rows)
     def scatter(self, x, y, log=False, show=True):
+        plt, sns = self._plotting()
         fig, ax = plt.subplots(figsize=(7, 5))
         sns.scatterplot(data=self.df, x=x, y=y, color=self.palette["main"], ax=ax)
         ax.set_title(f"{x} vs {y}")
@@ -93,19 +175,27 @@ class MoviePlotter:
             plt.show()
         return fig, ax
 
-    # Boxplot by genre 
+    # Boxplot by genre (genre_col="genre_mask": each movie counts in every one of its genres)
+    @timed(rows=_plot_rows)
     def box_by_genre(self, column, genre_col="genre_main", show=True):
+        plt, sns = self._plotting()
         if genre_col not in self.df.columns:
-            print("Column 'genre_main' not found.")
+            print(f"Column '{genre_col}' not found.")
             return
 
         # Drop missing values + trimming 
-        trimmed_df = self.df[[genre_col, column]].dropna().copy() 
-        filtered_values = self.trimmed(column)
-        trimmed_df = trimmed_df[trimmed_df[column].isin(filtered_values)]
+        if genre_col == "genre_mask":
+            rows, genres = explode_genres(self.df[genre_col].to_numpy()[self.trim_mask(column)])
+            values = self.df[column].to_numpy(dtype="float64", na_value=np.nan)[self.trim_mask(column)]
+            trimmed_df = pd.DataFrame({genre_col: pd.Categorical.from_codes(genres, canon_genres),
+                                       column: values[rows]})
+        else:
+            keep = self.trim_mask(column) & self.df[genre_col].notna().to_numpy()
+            trimmed_df = self.df.loc[keep, [genre_col, column]]
 
         # Colors
-        levels = list(trimmed_df[genre_col].value_counts().index)  
+        counts = trimmed_df[genre_col].value_counts()
+        levels = list(counts[counts > 0].index)  # categorical columns also list empty genres
         pal, _ = self._cat_palette(levels, cmap="crest")           
         colors = [pal[g] for g in levels] 
           
@@ -121,7 +211,9 @@ class MoviePlotter:
         return fig, ax
     
     # ROI vs Rating map (by genre)
+    @timed(rows=_plot_rows)
     def roi_vs_rating(self, genre_col="genre_main", show=True):
+        plt, sns = self._plotting()
 
         # Check required columns
         for c in ["roi", "rating", genre_col]:
@@ -130,16 +222,15 @@ class MoviePlotter:
                 return
 
         # Drop missing values + trimming (ROI and Rating)
-        trimmed_df = self.df[[genre_col, "roi", "rating"]].dropna().copy()
-        trimmed_df = trimmed_df[trimmed_df["roi"].isin(self.trimmed("roi"))]
-        trimmed_df = trimmed_df[trimmed_df["rating"].isin(self.trimmed("rating"))]
+        keep = self.trim_mask("roi") & self.trim_mask("rating") & self.df[genre_col].notna().to_numpy()
+        trimmed_df = self.df.loc[keep, [genre_col, "roi", "rating"]]
 
         # Plot
-        pal, _ = self._cat_palette(trimmed_df[genre_col], cmap="crest")
+        pal, levels = self._cat_palette(trimmed_df[genre_col], cmap="crest")
 
         fig, ax = plt.subplots(figsize=(8, 6))
         sns.scatterplot(data=trimmed_df, x="rating", y="roi",
-                        hue=genre_col, palette=pal,
+                        hue=genre_col, hue_order=levels, palette=pal,  # legend in order of appearance
                         alpha=0.7, s=55, edgecolor="white", linewidth=0.4, ax=ax)
 
         roi_low = trimmed_df["roi"].quantile(0.01)
@@ -157,7 +248,9 @@ class MoviePlotter:
 
 
     # Correlation heatmap
+    @timed(rows=_plot_rows)
     def corr_heatmap(self, show=True):
+        plt, sns = self._plotting()
         cols = ["budget_num", "income_num", "profit", "roi", "rating", "runtime_min"]
         cols = [c for c in cols if c in self.df.columns]
         fig, ax = plt.subplots(figsize=(8, 6))
@@ -168,7 +261,9 @@ class MoviePlotter:
         return fig, ax
 
     # Line plot over the years 
+    @timed(rows=_plot_rows)
     def line_by_year(self, y):
+        plt, sns = self._plotting()
         data = self.df.groupby("year")[y].mean().reset_index()
         plt.figure(figsize=(9,5))
         sns.lineplot(data=data, x="year", y=y, color=self.palette["dark"])
@@ -176,7 +271,9 @@ class MoviePlotter:
         plt.show()
     
     # Share of hits per year
+    @timed(rows=_plot_rows)
     def hit_trend_over_time(self, year_col="year", hit_col="hit", show=True):
+        plt, sns = self._plotting()
     
         if year_col not in self.df.columns or hit_col not in self.df.columns:
             print("Columns not found.")
@@ -212,7 +309,9 @@ class MoviePlotter:
         return fig, ax
     
     # Share of hits per runtime
+    @timed(rows=_plot_rows)
     def hit_by_runtime_bucket(self, runtime_col: str = "runtime_min", hit_col: str = "hit", show=True):
+        plt, sns = self._plotting()
 
         if runtime_col not in self.df.columns or hit_col not in self.df.columns:
             print("Columns not found.")
@@ -221,9 +320,7 @@ class MoviePlotter:
         d = self.df[[runtime_col, hit_col]].dropna().copy()
         
         # standard buckets
-        bins = [0, 90, 110, 130, 150, 1_000]
-        labels = ["<90", "90–110", "110–130", "130–150", "≥150"]
-        d["runtime_bucket"] = pd.cut(d[runtime_col], bins=bins, labels=labels, right=False)
+        d["runtime_bucket"] = pd.cut(d[runtime_col], bins=runtime_bins, labels=runtime_labels, right=False)
 
         share = (d.groupby("runtime_bucket")[hit_col].mean().mul(100).reset_index(name="hit_share"))
 
@@ -242,15 +339,17 @@ class MoviePlotter:
         return fig, ax
    
     # Graphic summary for a single movie
+    @timed(rows=_plot_rows)
     def plot_movie_summary(self, movie, show: bool = True, block: bool = False):
+        plt, _ = self._plotting()
 
         rating = float(movie.rating) if movie.rating is not None else 0.0
         roi    = float(movie.roi) if (movie.roi is not None and np.isfinite(movie.roi)) else 0.0
-        is_hit = bool(movie.is_hit())
+        is_hit = bool(movie.is_hit(self.thresholds))
 
         # Cap ROI
         try:
-            roi_cap = float(self.df["roi"].dropna().quantile(0.99))
+            roi_cap = self.sketch("roi").quantile(0.99)
         except Exception:
             roi_cap = max(1.0, roi)
         xmax_roi = max(roi_cap, roi, 1.0)
@@ -311,6 +410,92 @@ class MoviePlotter:
 
 
 
+# Class for the hit thresholds of a dataset version
+class HitThresholds:
+    """Registry of the hit thresholds (quantiles of rating and ROI) of a dataset version.
+    It is computed once when the metrics are created, saved next to the metrics file
+    (`<name>.thresholds.json`) and read by `Movie`, `MoviePlotter` and the scripts, so
+    classifying a single film is a lookup instead of a scan of the dataset.
+
+    Attributes:
+        overall (dict): {"rating": cut, "roi": cut} over the whole dataset (defines `hit`).
+        by_genre (dict): Same cuts per main genre.
+        by_decade (dict): Same cuts per decade.
+        q (float): Quantile used for the cuts.
+        version (str): Content hash of the rating/ROI columns the cuts come from
+            (see `version_of`), checked by `matches` against a loaded dataset.
+    """
+    def __init__(self, overall, by_genre=None, by_decade=None, q=0.75, version=""):
+        self.overall = overall
+        self.by_genre = by_genre or {}
+        self.by_decade = by_decade or {}
+        self.q = q
+        self.version = version
+
+    # Compute the thresholds from a metrics dataframe (exact quantiles: the overall cuts define `hit`)
+    @staticmethod
+    def from_frame(df, q=0.75, overall=None):
+        def cuts(d):
+            return {"rating": float(d["rating"].quantile(q)), "roi": float(d["roi"].quantile(q))}
+
+        def grouped(col):
+            if col not in df.columns:
+                return {}
+            return {k: cuts(g) for k, g in df.groupby(col, observed=True) if pd.notna(k)}
+
+        return HitThresholds(
+            overall=overall or cuts(df),
+            by_genre=grouped("genre_main"),
+            by_decade={int(k): v for k, v in grouped("decade").items()},
+            q=q,
+            version=HitThresholds.version_of(df),
+        )
+
+    # Content hash of the rating/ROI columns (rounded: a CSV round-trip may change the last digit)
+    @staticmethod
+    def version_of(df):
+        values = df[["rating", "roi"]].astype("float64").round(9)
+        return f"{int(pd.util.hash_pandas_object(values, index=False).sum()):016x}"
+
+    # Whether the thresholds were computed from this dataset (False for a stale registry)
+    def matches(self, df):
+        return self.version == HitThresholds.version_of(df)
+
+    # Rating and ROI cuts, for a genre/decade when available
+    def cuts(self, genre=None, decade=None):
+        if genre is not None and genre in self.by_genre:
+            c = self.by_genre[genre]
+        elif decade is not None and int(decade) in self.by_decade:
+            c = self.by_decade[int(decade)]
+        else:
+            c = self.overall
+        return c["rating"], c["roi"]
+
+    @staticmethod
+    def path_for(metrics_path):
+        return Path(metrics_path).with_suffix(".thresholds.json")
+
+    def save(self, metrics_path):
+        data = {"version": self.version, "q": self.q, "overall": self.overall,
+                "genre": self.by_genre, "decade": {str(k): v for k, v in self.by_decade.items()}}
+        HitThresholds.path_for(metrics_path).write_text(json.dumps(data, indent=2))
+
+    # Load the registry saved next to a metrics file (None if missing)
+    @staticmethod
+    def load(metrics_path):
+        path = HitThresholds.path_for(metrics_path)
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text())
+        return HitThresholds(
+            overall=data["overall"],
+            by_genre=data["genre"],
+            by_decade={int(k): v for k, v in data["decade"].items()},
+            q=data["q"],
+            version=data["version"],
+        )
+
+
 # Class for analysis of a single movie
 class Movie:
     """A class representing an individual movie with basic financial and rating information.
@@ -321,7 +506,11 @@ class Movie:
         rating (float): IMDb rating.
         profit (float): (income - budget).
         roi (float | None): Return on investment (profit / budget), or None if budget ≤ 0.
+        thresholds (HitThresholds | None): Class-level registry used by `is_hit()`;
+            when None, the fixed rule ROI > 1 and rating > 7 is used.
     """
+    thresholds = None
+
     def __init__(self, title, budget, income, rating):
         self.title = title
         self.budget = budget
@@ -330,8 +519,18 @@ class Movie:
         self.profit = income - budget
         self.roi = income / budget if budget > 0 else None
 
-    def is_hit(self):
-        return self.roi and self.roi > 1 and self.rating > 7
+    # Hit status; with `genre`/`decade`, compared with the movies of that genre/decade only
+    # (without them: same rule as the dataset `hit` column)
+    def is_hit(self, thresholds=None, genre=None, decade=None):
+        thresholds = thresholds or Movie.thresholds
+        if thresholds is None:
+            return self.roi and self.roi > 1 and self.rating > 7
+
+        # dataset ROI is profit / budget
+        if self.roi is None or self.rating is None or pd.isna(self.rating):
+            return False
+        rating_cut, roi_cut = thresholds.cuts(genre, decade)
+        return self.rating >= rating_cut and self.profit / self.budget >= roi_cut
 
     def describe(self):
         print(f"🎬 {self.title} → ROI: {self.roi:.2f}, Rating: {self.rating}")
@@ -344,4 +543,138 @@ class Movie:
             budget=row.get("budget_num"),
             income=row.get("income_num"),
             rating=row.get("rating")
-        )
\ No newline at end of file
+        )
+
+    # Same metrics and hit rule for many movies at once (no Movie objects)
+    @staticmethod
+    def classify(budget, income, rating, thresholds=None) -> pd.DataFrame:
+        """Vectorized version of `profit`, `roi` and `is_hit()` over arrays.
+        Zero, negative or missing budgets give ROI NaN (None for a single Movie),
+        and missing ROI or rating are never hits.
+        Args:
+            budget, income, rating (array-like): Values for each movie (same length).
+            thresholds (HitThresholds | None): As in `is_hit()`.
+        Returns:
+            pd.DataFrame: Columns profit, roi and hit (bool), one row per movie.
+        """
+        index = budget.index if isinstance(budget, pd.Series) else None
+        budget = np.asarray(budget, dtype="float64")
+        income = np.asarray(income, dtype="float64")
+        rating = np.asarray(rating, dtype="float64")
+
+        profit = income - budget
+        with np.errstate(divide="ignore", invalid="ignore"):
+            roi = np.where(budget > 0, income / budget, np.nan)
+            thresholds = thresholds or Movie.thresholds
+            if thresholds is None:
+                hit = (roi > 1) & (rating > 7)  # comparisons with NaN are False
+            else:
+                rating_cut, roi_cut = thresholds.cuts()
+                hit = (rating >= rating_cut) & (np.where(budget > 0, profit / budget, np.nan) >= roi_cut)
+        return pd.DataFrame({"profit": profit, "roi": roi, "hit": hit}, index=index)
+
+    # Batch classification of a dataframe (same columns as from_row)
+    @staticmethod
+    def classify_frame(df, thresholds=None) -> pd.DataFrame:
+        return Movie.classify(df["budget_num"], df["income_num"], df["rating"], thresholds)
+
+
+
+# Class for pre-aggregated statistics of the metrics dataset
+class MetricsCube:
+    """A small OLAP-style cube of the metrics dataset, keyed by genre mask × hit × year × runtime bucket.
+    Each cell holds row counts, sums and sums of squares of the numeric measures, and, over
+    the rows where all measures are present, shifted sums and cross-products. Filtered
+    trends, hit shares and correlations are then computed from a few thousand cells
+    instead of the rows. The genre mask (see `src/genres.py`) gives both the main genre
+    and the secondary genres of a cell.
+
+    Attributes:
+        measures (list[str]): Numeric columns aggregated in the cube.
+        cells (pd.DataFrame): One row per non-empty cell (MultiIndex of the 4 keys).
+        shift (pd.Series): Global mean of each measure, subtracted before the cross-products
+            (keeps them numerically stable).
+    """
+    keys = ["genre_mask", "hit", "year", "runtime_bucket"]
+
+    def __init__(self, df):
+        self.measures = [c for c in ["budget_num", "income_num", "profit", "roi", "rating", "runtime_min"]
+                         if c in df.columns]
+        x = df[self.measures].astype("float64")
+        self.shift = x.mean().fillna(0.0)
+
+        bucket = pd.cut(x["runtime_min"], bins=runtime_bins, right=False, labels=False) \
+            if "runtime_min" in x.columns else pd.Series(np.nan, index=df.index)
+        keys = pd.DataFrame({
+            "genre_mask": genre_mask_of(df),
+            "hit": df["hit"].astype(bool),
+            "year": df["year"].astype("float64"),
+            "runtime_bucket": bucket,
+        })
+
+        values = {"n": np.ones(len(df)), "n_hit": df["hit"].astype("float64").to_numpy()}
+        for m in self.measures:
+            present = x[m].notna()
+            values[f"n_{m}"] = present.to_numpy(dtype="float64")
+            values[f"sum_{m}"] = x[m].fillna(0.0).to_numpy()
+            values[f"sumsq_{m}"] = (x[m] ** 2).fillna(0.0).to_numpy()
+
+        # Complete rows (all measures present): shifted sums and cross-products
+        complete = x.notna().all(axis=1).to_numpy()
+        centered = (x - self.shift).mul(complete, axis=0).fillna(0.0)
+        values["n_cc"] = complete.astype("float64")
+        for i, a in enumerate(self.measures):
+            values[f"cc_{a}"] = centered[a].to_numpy()
+            for b in self.measures[i:]:
+                values[f"cc_{a}*{b}"] = (centered[a] * centered[b]).to_numpy()
+
+        self.cells = pd.DataFrame(values, index=df.index).groupby(
+            [keys[k] for k in self.keys], dropna=False).sum()
+
+    # Cells matching the app filters (secondary: genre anywhere in the genre list, not only main)
+    def select(self, genre=None, only_hits=False, secondary=False):
+        cells = self.cells
+        if genre is not None:
+            cells = cells[match_genre(cells.index.get_level_values("genre_mask"), genre, secondary)]
+        if only_hits:
+            cells = cells[cells.index.get_level_values("hit")]
+        return cells
+
+    # Number of rows matching the filters
+    def count(self, genre=None, only_hits=False, secondary=False):
+        return int(self.select(genre, only_hits, secondary)["n"].sum())
+
+    # Yearly mean of a measure (rows with year and measure present)
+    def mean_by_year(self, metric, genre=None, only_hits=False, secondary=False):
+        by_year = self.select(genre, only_hits, secondary).groupby(level="year")[[f"n_{metric}", f"sum_{metric}"]].sum()
+        by_year = by_year[by_year[f"n_{metric}"] > 0]
+        return (by_year[f"sum_{metric}"] / by_year[f"n_{metric}"]).rename(metric).reset_index()
+
+    # Share of hits (%) per year
+    def hit_share_by_year(self, genre=None, only_hits=False, secondary=False):
+        by_year = self.select(genre, only_hits, secondary).groupby(level="year")[["n", "n_hit"]].sum()
+        return (by_year["n_hit"] / by_year["n"] * 100).rename("hit").reset_index()
+
+    # Share of hits (%) per runtime bucket (all buckets, NaN when empty)
+    def hit_share_by_runtime(self, genre=None, only_hits=False, secondary=False):
+        by_bucket = self.select(genre, only_hits, secondary).groupby(level="runtime_bucket")[["n", "n_hit"]].sum()
+        by_bucket = by_bucket.reindex(range(len(runtime_labels)))
+        share = (by_bucket["n_hit"] / by_bucket["n"] * 100).to_numpy()
+        return pd.DataFrame({"runtime_bucket": pd.Categorical(runtime_labels, categories=runtime_labels,
+                                                              ordered=True),
+                             "hit": share})
+
+    # Pearson correlations over the complete rows; returns (matrix, number of rows)
+    def corr(self, genre=None, only_hits=False, columns=None, secondary=False):
+        cols = [c for c in (columns or self.measures) if c in self.measures]
+        total = self.select(genre, only_hits, secondary).sum()
+        n = total["n_cc"]
+        s = pd.Series({c: total[f"cc_{c}"] for c in cols})
+        cov = pd.DataFrame(index=cols, columns=cols, dtype="float64")
+        for i, a in enumerate(self.measures):
+            for b in self.measures[i:]:
+                if a in cols and b in cols:
+                    cov.loc[a, b] = cov.loc[b, a] = total[f"cc_{a}*{b}"] - s[a] * s[b] / n if n else np.nan
+        std = np.sqrt(np.diag(cov.to_numpy()))
+        return cov / np.outer(std, std), int(n)
+
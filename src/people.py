@@ -0,0 +1,141 @@
+#PEOPLE
+import numpy as np
+import pandas as pd
+
+
+def _split_names(raw) -> list[str]:
+    """Distinct names of a comma-joined credit string ("Sam Worthington, Zoe Saldana"),
+    compared case-insensitively (first spelling kept)."""
+    names = {}
+    for n in str(raw).split(","):
+        if n.strip():
+            names.setdefault(n.strip().casefold(), n.strip())
+    return list(names.values())
+
+
+# Class for people-centric queries (directors, stars) over the metrics dataset
+class PeopleIndex:
+    """Person-ID table and inverted indexes (person -> row positions) of the credit columns.
+    Every distinct name gets one integer ID, shared by all roles (a director who also
+    stars in a film has a single ID). Names are compared case-insensitively: spellings
+    that differ only in case are one person, displayed with the first spelling met. For each role the credits are stored as a CSR
+    structure: the rows of person `i` are `rows[offsets[i]:offsets[i + 1]]`, sorted, so
+    finding the films of a person never scans the table.
+    The comma-joined strings are split once per distinct value, the rest is vectorized.
+
+    Attributes:
+        df (pd.DataFrame): Dataset the row positions refer to (for `iloc`).
+        names (np.ndarray): Name of each person ID.
+        roles (list[str]): Indexed credit columns (e.g. "directors", "stars").
+        n_credits (dict[str, int]): Number of (person, film) pairs per role.
+    """
+    def __init__(self, df, roles=("directors", "stars")):
+        self.df = df
+        self.roles = [r for r in roles if r in df.columns]
+        self._stats = {}
+
+        # names of each distinct credit string, per role
+        split = {}
+        for role in self.roles:
+            codes, uniques = pd.factorize(df[role])
+            split[role] = (codes, [_split_names(u) for u in uniques])
+
+        # person IDs shared by all roles, on the case-folded name
+        all_names = [n for role in self.roles for names in split[role][1] for n in names]
+        person_of_name, keys = pd.factorize(pd.Series([n.casefold() for n in all_names], dtype=object))
+        _, first = np.unique(person_of_name, return_index=True)  # first spelling of each person
+        self.names = np.asarray(all_names, dtype=object)[first]
+        self._ids = {key: i for i, key in enumerate(keys)}
+
+        self._credits = {}
+        self.n_credits = {}
+        start = 0
+        for role in self.roles:
+            codes, names = split[role]
+            lengths = np.array([len(n) for n in names] + [0], dtype=np.int64)  # last: missing (code -1)
+            first = np.concatenate([[0], np.cumsum(lengths[:-1])]) + start
+            start += int(lengths.sum())
+
+            # one (person, row) pair per credit
+            per_row = lengths[codes]
+            rows = np.repeat(np.arange(len(df)), per_row)
+            within = np.arange(per_row.sum()) - np.repeat(np.cumsum(per_row) - per_row, per_row)
+            persons = person_of_name[np.repeat(first[codes], per_row) + within]
+
+            # sorted by person, then row (stable sort of pairs generated in row order)
+            order = np.argsort(persons, kind="stable")
+            persons, rows = persons[order], rows[order]
+            offsets = np.searchsorted(persons, np.arange(len(self.names) + 1))
+            self._credits[role] = (offsets, rows)
+            self.n_credits[role] = len(rows)
+
+    def __len__(self):
+        return len(self.names)
+
+    # Person ID of a name (case-insensitive), None if unknown
+    def person_id(self, name):
+        return self._ids.get(str(name).strip().casefold())
+
+    # Sorted row positions of the films of a person (one role, or all roles)
+    def rows(self, name, role=None) -> np.ndarray:
+        pid = self.person_id(name)
+        if pid is None:
+            return np.empty(0, dtype=np.int64)
+        parts = []
+        for r in ([role] if role else self.roles):
+            offsets, rows = self._credits[r]
+            parts.append(rows[offsets[pid]:offsets[pid + 1]])
+        return np.unique(np.concatenate(parts)) if len(parts) > 1 else parts[0]
+
+    # Films of a person (rows of `df`)
+    def films(self, name, role=None) -> pd.DataFrame:
+        return self.df.iloc[self.rows(name, role)]
+
+    # Number of films per person for each role (people table)
+    def people(self) -> pd.DataFrame:
+        table = pd.DataFrame({"name": self.names})
+        for role in self.roles:
+            table[f"n_{role}"] = np.diff(self._credits[role][0])
+        table.index.name = "person_id"
+        return table
+
+    # Per-person aggregates of a role: films, hits, hit share, median ROI, mean rating
+    def stats(self, role) -> pd.DataFrame:
+        if role not in self._stats:
+            offsets, rows = self._credits[role]
+            persons = np.repeat(np.arange(len(self.names)), np.diff(offsets))
+            n = np.diff(offsets)
+            has_films = n > 0
+
+            hit = self.df["hit"].to_numpy(dtype=bool)[rows] if "hit" in self.df.columns \
+                else np.zeros(len(rows), dtype=bool)
+            hits = np.bincount(persons, weights=hit, minlength=len(self.names))
+            table = pd.DataFrame({"name": self.names, "films": n, "hits": hits.astype(np.int64),
+                                  "hit_share": np.where(has_films, hits / np.maximum(n, 1), np.nan)})
+
+            if "rating" in self.df.columns:
+                rating = self.df["rating"].to_numpy(dtype="float64", na_value=np.nan)[rows]
+                rated = ~np.isnan(rating)
+                total = np.bincount(persons[rated], weights=rating[rated], minlength=len(self.names))
+                count = np.bincount(persons[rated], minlength=len(self.names))
+                table["mean_rating"] = np.where(count > 0, total / np.maximum(count, 1), np.nan)
+            if "roi" in self.df.columns:
+                roi = self.df["roi"].to_numpy(dtype="float64", na_value=np.nan)[rows]
+                table["median_roi"] = pd.Series(roi).groupby(persons).median() \
+                    .reindex(range(len(self.names))).to_numpy()
+
+            table.index.name = "person_id"
+            self._stats[role] = table[has_films]
+        return self._stats[role]
+
+    # Aggregates of one person for a role (None if the person has no film in that role)
+    def person_stats(self, name, role):
+        pid = self.person_id(name)
+        table = self.stats(role)
+        return table.loc[pid] if pid is not None and pid in table.index else None
+
+    # Ranking of the people of a role with at least `min_films` films
+    def top(self, role, by="hit_share", min_films=3, n=20) -> pd.DataFrame:
+        table = self.stats(role)
+        table = table[table["films"] >= min_films]
+        return table.sort_values([by, "films"], ascending=False, kind="stable").head(n)
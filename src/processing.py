@@ -1,11 +1,23 @@
 #FUNCTIONS
 import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
 import re
+import os
+import time
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
+from src.models import HitThresholds
+from src.genres import canon_genres, genre_bits
+from src.profiling import stage, timed, current_profiler
+
 
 
 #Loading the raw dataset
+@timed()
 def load_data(path: str = "data/movies.csv") -> pd.DataFrame:
     """Loads the raw movie dataset from a CSV file.
     Args:
@@ -35,12 +47,7 @@ _months_map = {
     "jul": 7, "aug": 8, "sep": 9, "oct": 10, "nov": 11, "dec": 12
 }
 
-# Genre mapping
-canon_genres = [
-    "Action","Adventure","Animation","Comedy","Crime","Drama",
-    "Fantasy","Horror","Mystery","Romance","Sci-Fi","Thriller"
-]
-
+# Genre mapping (canonical genres in src/genres.py)
 genre_keywords = {
     "Action":   ["action"],
     "Adventure":["adventure"],
@@ -97,8 +104,213 @@ def _pick_main(gen_agg: str | None) -> str | None:
     return gen_agg.split(",")[0].strip()
 
 
+# Main genre and genre mask for a whole column
+def _map_genres(genre: pd.Series) -> tuple[pd.Series, np.ndarray]:
+    """Maps a column of raw genre strings to their main canonical genre and to the
+    bitmask of all their canonical genres (see `src/genres.py`).
+    The raw strings are factorized first, so `_map_genres_string` and `_pick_main`
+    run once per distinct value (a few hundred) instead of once per row; the
+    result is then broadcast back to every row with a single array take.
+    Args:
+        genre (pd.Series): Raw genre column.
+    Returns:
+        tuple[pd.Series, np.ndarray]: Main genre per row (None if missing or not
+        recognized) and uint16 genre mask per row (0 if none).
+    """
+    codes, uniques = pd.factorize(genre)
+    canon = [_map_genres_string(u) for u in uniques]
+    mains = np.array([_pick_main(c) for c in canon] + [None], dtype=object)
+    masks = np.array([sum(genre_bits[g] for g in c.split(", ")) if c else 0 for c in canon] + [0],
+                     dtype=np.uint16)
+    # code -1 (NaN) -> None / 0
+    return pd.Series(mains[codes], index=genre.index, name=genre.name), masks[codes]
+
+
+def _map_genre_main(genre: pd.Series) -> pd.Series:
+    """Main canonical genre per row, identical to
+    `genre.apply(lambda x: _pick_main(_map_genres_string(x)))` (see `_map_genres`)."""
+    return _map_genres(genre)[0]
+
+
+# Numeric parsing: raw text -> number text, per format
+_not_money = re.compile(r"[^\d.]")
+_first_digits = re.compile(r"\d+")
+
+def _money_text(raw: str) -> str:
+    text = raw.replace(",", "").lstrip("$")  # fast path for the common "$1,234,567"
+    return text if text.isascii() and text.isdigit() else _not_money.sub("", raw)
+
+def _first_int_text(raw: str) -> str:
+    match = _first_digits.search(raw)
+    return match.group() if match else ""
+
+number_formats = {
+    "money": _money_text,                               # "$1,234.5" / "€35,000" / "Unknown"
+    "thousands": lambda raw: raw.replace(",", ""),      # "1,234,567"
+    "first_int": _first_int_text,                       # "142 min"
+}
+
+def _arrow_money_text(arr: pa.Array) -> pa.Array:
+    text = pc.replace_substring(pc.utf8_ltrim(arr, characters="$"), ",", "")  # fast path, as `_money_text`
+    other = pc.invert(pc.fill_null(pc.ascii_is_decimal(text), False)).to_numpy(zero_copy_only=False)
+    if not other.any():
+        return text
+    regexed = pc.replace_substring_regex(arr.filter(pa.array(other)), r"[^0-9.]", "")
+    return pc.replace_with_mask(text, pa.array(other), regexed)
+
+# Same reductions on an Arrow string array (ASCII rows only, see `_parse_vectorized`)
+_arrow_formats = {
+    "money": _arrow_money_text,
+    "thousands": lambda arr: pc.replace_substring(arr, ",", ""),
+    "first_int": lambda arr: pc.struct_field(pc.extract_regex(arr, r"(?P<n>[0-9]+)"), [0]),
+}
+
+# Columns with more distinct values than this share of their rows (estimated on a
+# sample) are parsed with Arrow kernels instead of once per distinct value
+parse_unique_ratio = 0.5
+parse_sample_rows = 10_000
+
+def parse_numbers(col: pd.Series, fmt: str = "money") -> pd.Series:
+    """Parses a raw text column (currency, thousands separators, "Unknown", units)
+    into numbers. The strategy depends on the number of distinct values:
+        - few (dataset budgets, runtimes): each distinct raw string is reduced to its
+          number text and converted once, and the results are broadcast back to
+          the rows with one array take (no intermediate object columns)
+        - mostly distinct (votes, gross of a large catalog): the text is reduced and
+          cast with vectorized Arrow kernels; only rows that are not plain digits or
+          decimals (e.g. "Unknown", non-ASCII text) go through the first path.
+    Output is identical to the former `astype(str)` -> regex -> `pd.to_numeric(errors="coerce")`
+    chains: int64 when every row holds an integer, float64 (NaN if unparsable) otherwise.
+    Args:
+        col (pd.Series): Raw column.
+        fmt (str): One of `number_formats` ("money", "thousands", "first_int").
+    Returns:
+        pd.Series: Parsed numbers (same index as `col`).
+    """
+    if len(col) > parse_sample_rows:
+        sample = col.iloc[::len(col) // parse_sample_rows]
+        if sample.nunique(dropna=False) > parse_unique_ratio * len(sample):
+            values = _parse_vectorized(col, fmt)
+            if values is not None:
+                return pd.Series(values, index=col.index, name=col.name)
+    return _parse_distinct(col, fmt)
+
+
+def _parse_distinct(col: pd.Series, fmt: str) -> pd.Series:
+    """`parse_numbers` for columns with few distinct values: one conversion per value."""
+    to_text = number_formats[fmt]
+    codes, uniques = pd.factorize(col)
+    values = np.full(len(uniques) + 1, np.nan)  # last slot: missing values (code -1)
+    texts = [to_text(str(raw)) for raw in uniques]
+    integral = True
+    for i, text in enumerate(texts):
+        if not text.isascii():  # pandas only parses ASCII digits
+            integral = False
+            continue
+        if text.isdigit():
+            values[i] = float(text)
+            continue
+        integral = False
+        try:
+            values[i] = float(text) if "_" not in text else np.nan
+        except ValueError:
+            pass
+
+    if integral and (codes >= 0).all():  # exact integers, as pd.to_numeric
+        values = np.array([int(t) for t in texts], dtype=np.int64)
+    values = values[codes]
+    return pd.Series(values, index=col.index, name=col.name)
+
+
+def _parse_vectorized(col: pd.Series, fmt: str) -> np.ndarray | None:
+    """`parse_numbers` for mostly distinct columns, with Arrow compute kernels.
+    Rows whose raw text is ASCII and reduces to plain digits (up to 18, fits int64) or
+    a plain decimal are cast in bulk; the other rows (missing, "Unknown", non-ASCII
+    digits, exponents...) are parsed by `_parse_distinct`, so the result is the same.
+    Returns None when the column does not hold strings only (e.g. mixed objects).
+    """
+    try:
+        raw = pa.array(col.to_numpy(dtype=object), type=pa.string(), from_pandas=True)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        return None
+    text = _arrow_formats[fmt](raw)
+    ascii = pc.string_is_ascii(raw)
+
+    def rows_matching(pattern):
+        return pc.fill_null(pc.and_(ascii, pc.match_substring_regex(text, pattern)), False) \
+            .to_numpy(zero_copy_only=False)
+
+    is_int = rows_matching(r"^[0-9]{1,18}$")
+    is_dec = rows_matching(r"^([0-9]+\.[0-9]*|\.[0-9]+)$")
+    rest = ~(is_int | is_dec)
+    rest_values = _parse_distinct(col[rest], fmt).to_numpy() if rest.any() else np.empty(0, dtype=np.int64)
+
+    ints = pc.cast(text.filter(pa.array(is_int)), pa.int64()).to_numpy()
+    if not is_dec.any() and rest_values.dtype == np.int64:  # every row is an integer
+        values = np.empty(len(col), dtype=np.int64)
+    else:
+        values = np.empty(len(col), dtype=np.float64)
+        values[is_dec] = pc.cast(text.filter(pa.array(is_dec)), pa.float64()).to_numpy()
+    values[is_int] = ints
+    values[rest] = rest_values
+    return values
+
+
+# Row-local parsing of clean(), before the (title, year) dedup
+def _parse_columns(d: pd.DataFrame) -> pd.DataFrame:
+    """Parses runtime, votes, gross, rating, month and year (in place)."""
+    if "runtime" in d:
+        with stage("runtime", rows=len(d)):
+            d["runtime_min"] = parse_numbers(d["runtime"], "first_int")
+
+    if "votes" in d:
+        with stage("votes", rows=len(d)):
+            d["votes_num"] = parse_numbers(d["votes"], "thousands")
+        
+    if "gross" in d:
+        with stage("gross", rows=len(d)):
+            d["gross_usd"] = parse_numbers(d["gross"], "money")
+    
+    if "rating" in d:
+        with stage("rating", rows=len(d)):
+            d["rating"] = pd.to_numeric(d["rating"], errors="coerce")
+
+    if "month" in d:
+        with stage("month", rows=len(d)):
+            d["month_num"] = (
+                d["month"].astype(str).str.lower().str[:3].map(_months_map)
+            ).astype("Int64")
+    
+    if "year" in d:
+        with stage("year", rows=len(d)):
+            d["year"] = pd.to_numeric(d["year"], errors="coerce")
+            d["decade"] = (d["year"] // 10 * 10).astype("Int64")
+    return d
+
+# Row-local parsing of clean(), after the (title, year) dedup
+def _parse_kept_columns(d: pd.DataFrame) -> pd.DataFrame:
+    """Parses budget and income and extracts the main genre and genre mask (in place)."""
+    # Convert budget and income to numeric ("Unknown" -> NaN)
+    for col in ["budget", "income"]:
+        if col in d.columns:
+            with stage(col, rows=len(d)):
+                d[f"{col}_num"] = parse_numbers(d[col], "money")
+
+
+    # Genre aggregation 
+    if "genre" in d.columns:
+    # Apply both cleaning and main-genre extraction once per distinct raw string
+        with stage("genre_main", rows=len(d)):
+            d["genre_main"], d["genre_mask"] = _map_genres(d["genre"])
+    return d
+
+
+# Minimum number of rows per partition of a parallel clean()
+clean_partition_rows = 50_000
+
 # "clean" function
-def clean(df: pd.DataFrame) -> pd.DataFrame:
+@timed(rows=lambda df, *a, **k: len(df))
+def clean(df: pd.DataFrame, workers: int | None = 1) -> pd.DataFrame:
     """Cleans and enriches the raw movie dataset.
     The function:
         - standardizes column names
@@ -106,9 +318,15 @@ def clean(df: pd.DataFrame) -> pd.DataFrame:
         - derives month_num and decade from date information
         - removes duplicated (title, year) pairs
         - converts budget and income to numeric versions
-        - normalizes genres and extracts the main genre.
+        - normalizes genres and extracts the main genre and the bitmask of all
+          canonical genres (`genre_mask`, see `src/genres.py`)
+        - stores genre, genre_main, certificate, month, country and filming location
+          as categorical columns (see `category_vocabularies`).
+    With `workers` > 1 the rows are split into contiguous partitions (at least
+    `clean_partition_rows` each) that are parsed in a process pool, see `_clean_parallel`.
     Args:
         df (pd.DataFrame): Raw input dataframe.
+        workers (int | None): Number of processes (1 = serial, None = one per CPU).
     Returns:
         pd.DataFrame: Cleaned and transformed dataframe.
     """
@@ -121,76 +339,249 @@ def clean(df: pd.DataFrame) -> pd.DataFrame:
          .str.replace(r"\s+", "_", regex=True)
          .str.replace(r"[^\w_]", "", regex=True)
     )
-    
-    if "runtime" in d:
-        d["runtime_min"] = pd.to_numeric(
-            d["runtime"].astype(str).str.extract(r"(\d+)")[0],
-            errors="coerce"
-        )
 
-    if "votes" in d:
-        d["votes_num"] = pd.to_numeric(
-            d["votes"].astype(str).str.replace(",", "", regex=False),
-            errors="coerce"
-        )
-        
-    if "gross" in d:
-        d["gross_usd"] = pd.to_numeric(
-            d["gross"].astype(str).str.replace(r"[^\d.]", "", regex=True),
-            errors="coerce"
-        )
-    
-    if "rating" in d:
-        d["rating"] = pd.to_numeric(d["rating"], errors="coerce")
+    workers = min(workers or os.cpu_count() or 1, len(d) // clean_partition_rows)
+    if workers > 1:
+        return _clean_parallel(d, workers)
 
-    if "month" in d:
-        d["month_num"] = (
-            d["month"].astype(str).str.lower().str[:3].map(_months_map)
-        ).astype("Int64")
-    
-    if "year" in d:
-        d["year"] = pd.to_numeric(d["year"], errors="coerce")
-        d["decade"] = (d["year"] // 10 * 10).astype("Int64")
+    d = _parse_columns(d)
     
     if {"title", "year"}.issubset(d.columns):
-        d = d.drop_duplicates(subset=["title", "year"])
-        
-    # Convert budget and income to numeric 
-    for col in ["budget", "income"]:
-        if col in d.columns:
-            s = d[col].astype(str).str.strip().replace({"Unknown": pd.NA})
-            s = s.str.replace(r"[^\d.]", "", regex=True) 
-            d[f"{col}_num"] = pd.to_numeric(s, errors="coerce")
+        with stage("dedup", rows=len(d)):
+            d = d.drop_duplicates(subset=["title", "year"])
 
+    d = _parse_kept_columns(d)
+    with stage("categories", rows=len(d)):
+        return _encode_categories(d)
 
-    # Genre aggregation 
-    if "genre" in d.columns:
-    # Apply both cleaning and main-genre extraction at once
-        d["genre_main"] = d["genre"].apply(lambda x: _pick_main(_map_genres_string(x)))
+
+_clean_source = None  # (frame, rows kept by the dedup) shared with the cleaning workers
+
+def _init_clean_worker(d: pd.DataFrame, keep: np.ndarray) -> None:
+    """Sets up a cleaning process: the whole frame is inherited (fork) or sent once."""
+    global _clean_source
+    _clean_source = (d, keep)
+
+
+def _clean_partition(bounds: tuple[int, int]) -> tuple[pd.DataFrame, list]:
+    """Cleans rows [start, stop) of the frame of `_init_clean_worker`.
+    Returns (cleaned rows, profiling records), as `_render_one`.
+    """
+    d, keep = _clean_source
+    start, stop = bounds
+    prof = current_profiler()
+    n_records = len(prof.records) if prof else 0
+    part = _parse_columns(d.iloc[start:stop].copy())
+    part = part[keep[start:stop]]  # rebinding drops the parent, as `d = d.drop_duplicates(...)`
+    return _parse_kept_columns(part), prof.records[n_records:] if prof else []
+
+
+def _clean_parallel(d: pd.DataFrame, workers: int) -> pd.DataFrame:
+    """Parallel path of `clean` (same output as the serial one).
+    The (title, year) duplicates are found first on the whole frame, so every
+    partition parses budget, income and genre of the kept rows only, as the serial
+    path does; the partitions are then concatenated in their original order.
+    Numeric columns come out int64 only when every partition is int64, i.e. when
+    every parsed row is an integer, as for the serial path.
+    Args:
+        d (pd.DataFrame): Raw dataframe with standardized column names.
+        workers (int): Number of processes.
+    Returns:
+        pd.DataFrame: Cleaned and transformed dataframe.
+    """
+    keep = np.ones(len(d), dtype=bool)
+    if {"title", "year"}.issubset(d.columns):
+        with stage("dedup", rows=len(d)):
+            year = pd.to_numeric(d["year"], errors="coerce")
+            keep = ~pd.DataFrame({"title": d["title"], "year": year}).duplicated().to_numpy()
+
+    edges = np.linspace(0, len(d), workers + 1).astype(int)
+    bounds = list(zip(edges[:-1], edges[1:]))
+    # fork where available: the raw frame is inherited instead of pickled for every worker
+    method = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context(method),
+                             initializer=_init_clean_worker, initargs=(d, keep)) as pool:
+        results = list(pool.map(_clean_partition, bounds))
+    if current_profiler():
+        current_profiler().records.extend(r for _, records in results for r in records)
+
+    with stage("concat", rows=int(keep.sum())):
+        d = pd.concat([part for part, _ in results])
+    with stage("categories", rows=len(d)):
+        return _encode_categories(d)  # after the concat: same categories as the serial path
+
+
+# Typed schema for the columnar (Parquet) copy of the cleaned/enriched datasets
+metrics_schema = {
+    "year": "Int64",
+    "decade": "Int64",
+    "month_num": "Int64",
+    "rating": "float64",
+    "runtime_min": "float64",
+    "votes_num": "float64",
+    "gross_usd": "float64",
+    "budget_num": "float64",
+    "income_num": "float64",
+    "profit": "float64",
+    "roi": "float64",
+    "hit": "bool",
+    "genre_mask": "uint16",
+}
+
+# Low-cardinality text columns stored as pandas Categorical (dictionary-encoded),
+# with a fixed vocabulary first; other values follow it in sorted order
+month_names = ["January", "February", "March", "April", "May", "June",
+               "July", "August", "September", "October", "November", "December"]
+
+category_vocabularies = {
+    "genre": [],
+    "genre_main": canon_genres,
+    "certificate": [],
+    "month": month_names,
+    "country_of_origin": [],
+    "filming_location": [],
+}
+
+def category_dtype(values: pd.Series, vocabulary: list[str] = ()) -> pd.CategoricalDtype:
+    """Categories of a column: `vocabulary`, then the other observed values (sorted).
+    They only depend on the set of values, so a column saved as text and read back
+    gets the same categories (and codes) as the frame that was saved.
+    Args:
+        values (pd.Series): Column to encode (text or categorical).
+        vocabulary (list[str]): Fixed leading categories (kept even if unused).
+    Returns:
+        pd.CategoricalDtype: Unordered categorical dtype.
+    """
+    known = set(vocabulary)
+    extra = sorted({v for v in values.dropna().unique() if v not in known}, key=str)
+    return pd.CategoricalDtype(list(vocabulary) + extra)
+
+
+def _encode_categories(d: pd.DataFrame) -> pd.DataFrame:
+    """Casts the columns of `category_vocabularies` to their categorical dtype (in place)."""
+    for col, vocabulary in category_vocabularies.items():
+        if col in d.columns:
+            d[col] = d[col].astype(category_dtype(d[col], vocabulary))
     return d
 
 
+def apply_schema(df: pd.DataFrame) -> pd.DataFrame:
+    """Casts the columns listed in `metrics_schema` to their explicit dtype and the
+    text columns of `category_vocabularies` to categorical.
+    Columns missing from the dataframe are skipped.
+    Args:
+        df (pd.DataFrame): Cleaned or enriched dataframe.
+    Returns:
+        pd.DataFrame: Dataframe with typed columns.
+    """
+    return _encode_categories(df.astype({c: t for c, t in metrics_schema.items() if c in df.columns}))
+
+
 # "save" function for new datasets
-def save_clean(df, path="data/movies_clean.csv") -> None:
+@timed(rows=lambda df, *a, **k: len(df))
+def save_clean(df, path="data/movies_clean.csv", columnar: bool = True) -> None:
     """Saves a dataframe to disk as a CSV file.
+    Two typed copies (same name) are also written, so readers do not need to
+    re-parse the CSV and re-infer dtypes:
+        - `.parquet`: compressed, fastest cold load
+        - `.arrow`: uncompressed Arrow IPC file that can be memory-mapped.
     Args:
         df (pd.DataFrame): Dataframe to save.
         path (str): Output file path.
+        columnar (bool): Whether to also write the Parquet and Arrow copies.
     """
     df.to_csv(path, index=False)
+    if columnar:
+        _save_columnar(df, Path(path))
+
+
+def _save_columnar(df: pd.DataFrame, csv_path: Path) -> None:
+    """Writes the typed Parquet and Arrow copies that sit next to a CSV file."""
+    typed = apply_schema(df)
+    typed.to_parquet(csv_path.with_suffix(".parquet"), index=False)
+    _write_arrow(typed, csv_path.with_suffix(".arrow"))
+
+
+def _write_arrow(df: pd.DataFrame, path: Path) -> None:
+    """Writes a typed dataframe as an uncompressed Arrow IPC file.
+    Float columns keep NaN as values (no validity bitmap), so that they can be
+    mapped into pandas without copying.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    for i, name in enumerate(table.column_names):
+        if pa.types.is_floating(table.schema.field(i).type):
+            table = table.set_column(i, name, pa.array(df[name].to_numpy(), from_pandas=False))
+
+    with pa.OSFile(str(path), "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+
+
+def _read_arrow(path: Path, columns: list[str] | None = None) -> pd.DataFrame:
+    """Reads an Arrow IPC file written by `_write_arrow` through a memory map.
+    Float columns are read-only views on the mapped file and string columns stay
+    Arrow-backed (`string[pyarrow]`), so processes loading the same file share
+    the same physical pages instead of holding private copies.
+    """
+    table = pa.ipc.open_file(pa.memory_map(str(path), "r")).read_all()
+    if columns is not None:
+        table = table.select(columns)
+    return table.to_pandas(split_blocks=True,
+                           types_mapper={pa.string(): pd.StringDtype("pyarrow")}.get)
+
+
+def _is_fresh(copy_path: Path, csv_path: Path) -> bool:
+    """True if a typed copy exists and is not older than its CSV."""
+    return copy_path.exists() and (not csv_path.exists()
+                                   or copy_path.stat().st_mtime >= csv_path.stat().st_mtime)
+
+
+# "read_metrics" function to load a cleaned/enriched dataset
+def read_metrics(path="data/Movies_metrics.csv", columns: list[str] | None = None,
+                 memory_map: bool = False) -> pd.DataFrame:
+    """Loads a dataset saved with `save_clean`, preferring the typed copies.
+    With `memory_map=True` the Arrow file is memory-mapped (zero-copy for
+    numeric and string columns); otherwise the Parquet file is read. A copy is
+    used only when it is not older than the CSV; if none is, the CSV is parsed
+    and `metrics_schema` is applied, so every path returns the same dtypes.
+    Args:
+        path (str): Path to the CSV file.
+        columns (list[str] | None): Columns to load (all if None).
+        memory_map (bool): Whether to memory-map the Arrow copy.
+    Returns:
+        pd.DataFrame: The typed dataset.
+    """
+    csv_path = Path(path)
+    arrow_path = csv_path.with_suffix(".arrow")
+    parquet_path = csv_path.with_suffix(".parquet")
+
+    if memory_map and _is_fresh(arrow_path, csv_path):
+        return _read_arrow(arrow_path, columns=columns)
+
+    if _is_fresh(parquet_path, csv_path):
+        return pd.read_parquet(parquet_path, columns=columns)
+
+    df = pd.read_csv(csv_path, usecols=columns)
+    return apply_schema(df if columns is None else df[columns])
 
 
 
 #File paths 
 raw_path  = Path("data/movies.csv")
 clean_path = Path("data/movies_clean.csv")
+metrics_path = Path("data/Movies_metrics.csv")
 
 # "run" function
-def run(input_path: str = str(raw_path), output_path: str = str(clean_path)) -> tuple[pd.DataFrame, pd.DataFrame]:
-    """Full cleaning pipeline: load raw data, clean it and save the result.
+@timed()
+def run(input_path: str = str(raw_path), output_path: str = str(clean_path),
+        save: bool = True, workers: int | None = 1) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Full cleaning pipeline: load raw data, clean it and (optionally) save the result.
     Args:
         input_path (str): Path to the raw CSV file.
         output_path (str): Path where the cleaned CSV will be saved.
+        save (bool): Whether to write the cleaned dataset to `output_path` (cast to
+            `metrics_schema`, as `run_chunked` writes it).
+        workers (int | None): Cleaning processes, see `clean` (1 = serial, None = one per CPU).
     Returns:
         tuple[pd.DataFrame, pd.DataFrame]: Tuple with (raw_df, cleaned_df).
     """
@@ -198,54 +589,437 @@ def run(input_path: str = str(raw_path), output_path: str = str(clean_path)) ->
     df_raw = load_data(input_path)
 
     print("Cleaning...")
-    df = clean(df_raw)
+    df = clean(df_raw, workers=workers)
 
-    print(f"Saved cleaned dataset to: {output_path}")
-    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
-    save_clean(df, output_path)
+    if save:
+        print(f"Saved cleaned dataset to: {output_path}")
+        Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+        save_clean(df.astype({c: t for c, t in metrics_schema.items() if c in df.columns}), output_path)
 
     return df_raw, df
 
-#"add_metrics" function to create new financial metrics
-def add_metrics(df: pd.DataFrame) -> pd.DataFrame:
-    """Adds financial metrics (profit, ROI, hit flag) to the dataset.
+
+# "run_chunked" function for raw files too large to fit in memory
+def run_chunked(input_path: str = str(raw_path), output_path: str = str(clean_path),
+                chunksize: int = 100_000) -> int:
+    """Streaming cleaning pipeline: reads the raw CSV in chunks, cleans each chunk
+    and appends it to the output file.
+    The rows held in memory are bounded by `chunksize`, not by the size of the raw file.
+    Duplicated (title, year) pairs are removed across chunk boundaries: a sorted
+    array with a 64-bit hash of every key already written (and the key itself) is
+    kept, and only the first occurrence of each pair is saved (same result as
+    `clean`). A hash already seen is confirmed on the key, so a hash collision never
+    drops a distinct row. These arrays grow with the number of distinct keys; each
+    chunk is looked up and merged into them with `searchsorted`, without re-sorting.
+    Each chunk is cast to `metrics_schema` before being written, so the output does
+    not depend on the dtypes inferred per chunk (same file as `run`).
+    Args:
+        input_path (str): Path to the raw CSV file.
+        output_path (str): Path where the cleaned CSV will be saved.
+        chunksize (int): Number of raw rows read and cleaned at a time.
+    Returns:
+        int: Number of cleaned rows written to `output_path`.
+    """
+    print(f"Loading raw dataset in chunks of {chunksize} rows: {input_path}")
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+
+    seen = np.empty(0, dtype=np.uint64)
+    seen_keys = np.empty(0, dtype=object)  # (title, year) of each hash, same order
+    n_rows = 0
+    try:
+        for i, chunk in enumerate(pd.read_csv(input_path, chunksize=chunksize)):
+            d = clean(chunk)
+
+            if {"title", "year"}.issubset(d.columns):
+                keys = pd.DataFrame({"title": d["title"], "year": d["year"].astype("float64")})
+                hashed = pd.util.hash_pandas_object(keys, index=False).to_numpy()
+                key_values = np.empty(len(keys), dtype=object)  # missing values as None (NaN != NaN)
+                key_values[:] = list(zip(keys["title"].astype(object).where(keys["title"].notna(), None),
+                                         keys["year"].astype(object).where(keys["year"].notna(), None)))
+
+                lo = np.searchsorted(seen, hashed, side="left")
+                hi = np.searchsorted(seen, hashed, side="right")
+                is_new = lo == hi
+                for j in np.flatnonzero(~is_new):  # hash already written: compare the keys
+                    is_new[j] = key_values[j] not in list(seen_keys[lo[j]:hi[j]])
+                d = d[is_new]
+
+                order = np.argsort(hashed[is_new], kind="stable")
+                new_hashes, new_keys = hashed[is_new][order], key_values[is_new][order]
+                pos = np.searchsorted(seen, new_hashes)
+                seen, seen_keys = np.insert(seen, pos, new_hashes), np.insert(seen_keys, pos, new_keys)
+
+            d = d.astype({c: t for c, t in metrics_schema.items() if c in d.columns})
+            d.to_csv(output_path, mode="w" if i == 0 else "a", header=(i == 0), index=False)
+            n_rows += len(d)
+
+    except FileNotFoundError:
+        print("Error: File not found. Check the path and file name.")
+        return 0
+    except pd.errors.ParserError:
+        print("Error: There was a problem reading the CSV file.")
+        return n_rows
+
+    print(f"Saved cleaned dataset to: {output_path} ({n_rows} rows)")
+    return n_rows
+
+#"compute_metrics" function to create new financial metrics in memory
+@timed(rows=lambda df, *a, **k: len(df))
+def compute_metrics(df: pd.DataFrame) -> tuple[pd.DataFrame, HitThresholds]:
+    """Adds financial metrics (profit, ROI, hit flag) to the dataset, without writing it.
     The hit variable is defined using the 75th percentile of rating and ROI.
     Args:
         df (pd.DataFrame): Cleaned dataframe with numeric budget and income.
     Returns:
-        pd.DataFrame: Dataframe with additional metric columns.
+        tuple[pd.DataFrame, HitThresholds]: Dataframe with additional metric columns
+        and the hit thresholds (overall, per genre and per decade) it was built with.
     """
     d = df.copy()
     d["profit"] = d["income_num"] - d["budget_num"]
     d["roi"] = (d["income_num"] - d["budget_num"]) / d["budget_num"]
 
-    rating_cut = d["rating"].quantile(0.75)
-    roi_cut = d["roi"].quantile(0.75)
+    with stage("quantiles", rows=len(d)):
+        thresholds = HitThresholds.from_frame(d, q=0.75)
+    rating_cut, roi_cut = thresholds.cuts()
     d["hit"] = (d["rating"] >= rating_cut) & (d["roi"] >= roi_cut)
-    
+    return d, thresholds
+
+
+# "save_metrics" function to write the enriched dataset and its hit thresholds
+@timed(rows=lambda df, *a, **k: len(df))
+def save_metrics(df: pd.DataFrame, thresholds: HitThresholds, path: str = str(metrics_path)) -> None:
+    """Saves the output of `compute_metrics`: CSV (+ Parquet/Arrow copies) and the
+    `HitThresholds` registry next to it.
+    Args:
+        df (pd.DataFrame): Dataframe with the metric columns.
+        thresholds (HitThresholds): Hit thresholds of `df`.
+        path (str): Output file path.
+    """
+    save_clean(df, path=path)
+    thresholds.save(path)
+    print(f"Saved cleaned and enriched dataset to: {path} (+ .parquet, hit thresholds)")
+
+
+#"add_metrics" function to create new financial metrics
+def add_metrics(df: pd.DataFrame, path: str = str(metrics_path)) -> pd.DataFrame:
+    """Adds financial metrics (profit, ROI, hit flag) to the dataset and saves it
+    (see `compute_metrics` and `save_metrics`).
+    Args:
+        df (pd.DataFrame): Cleaned dataframe with numeric budget and income.
+        path (str): Output file path.
+    Returns:
+        pd.DataFrame: Dataframe with additional metric columns.
+    """
     print("Adding financial metrics to the cleaned dataset")
-    
-    enriched_path = Path("data/Movies_metrics.csv")
-    save_clean(d, path=str(enriched_path))   
-    print(f"Saved cleaned and enriched dataset to: {enriched_path}")
-    
+    d, thresholds = compute_metrics(df)
+    save_metrics(d, thresholds, path=path)
+
     print("Done.")
     return d
 
 
+# Sorted copies of the hit columns, kept next to the metrics file for incremental updates
+def _sorted_values_path(csv_path: Path) -> Path:
+    return csv_path.with_suffix(".sorted.npz")
+
+
+# Columns of the per-group hit thresholds (`HitThresholds.by_genre` / `by_decade`)
+threshold_groups = ["genre_main", "decade"]
+
+
+def _group_name(col: str, key) -> str:
+    """Name of a group in the sorted arrays state (decades as integers, e.g. "decade|2010")."""
+    return f"{col}|{int(key) if col == 'decade' else key}"
+
+
+def _sorted_values_of(d: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Sorted rating/roi arrays of a metrics frame, overall ("rating") and per group
+    ("genre_main|Action|rating"), with the number of rows of each group ("genre_main|Action|n")."""
+    state = {c: np.sort(d[c].dropna().to_numpy(dtype="float64")) for c in ["rating", "roi"]}
+    for col in threshold_groups:
+        if col in d.columns:
+            for key, g in d.groupby(col, observed=True):
+                for c in ["rating", "roi"]:
+                    state[f"{_group_name(col, key)}|{c}"] = np.sort(g[c].dropna().to_numpy(dtype="float64"))
+                state[f"{_group_name(col, key)}|n"] = np.array([len(g)])
+    return state
+
+
+def _load_sorted_values(csv_path: Path, d: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Loads the sorted rating/roi arrays of a metrics file, rebuilding them if stale."""
+    state_path = _sorted_values_path(csv_path)
+    if _is_fresh(state_path, csv_path):
+        with np.load(state_path) as state:
+            if int(state["n_rows"]) == len(d) and any("|" in k for k in state.files):
+                return {k: state[k] for k in state.files if k != "n_rows"}
+    return _sorted_values_of(d)
+
+
+def _update_group_values(sorted_values: dict, rows: pd.DataFrame, insert: bool) -> None:
+    """Inserts (or removes) the rating/roi values of `rows` into the arrays of their groups."""
+    for col in threshold_groups:
+        if col not in rows.columns:
+            continue
+        for key, g in rows.groupby(col, observed=True):
+            group = _group_name(col, key)
+            n = int(sorted_values.get(f"{group}|n", np.array([0]))[0])
+            sorted_values[f"{group}|n"] = np.array([n + len(g) if insert else n - len(g)])
+            for c in ["rating", "roi"]:
+                arr = sorted_values.get(f"{group}|{c}", np.empty(0))
+                values = g[c].to_numpy(dtype="float64")
+                values = values[~np.isnan(values)]
+                sorted_values[f"{group}|{c}"] = _sorted_insert(arr, values) if insert else _sorted_remove(arr, values)
+
+
+def _group_cuts(sorted_values: dict, col: str, q: float) -> dict:
+    """Per-group cuts of one column of `threshold_groups` (groups that still have rows)."""
+    cuts = {}
+    for name in sorted_values:
+        group_col, _, rest = name.partition("|")
+        key, _, field = rest.rpartition("|")
+        if group_col == col and field == "n" and int(sorted_values[name][0]) > 0:
+            cuts[int(key) if col == "decade" else key] = {
+                c: _sorted_quantile(sorted_values[f"{col}|{key}|{c}"], q) for c in ["rating", "roi"]}
+    return dict(sorted(cuts.items()))
+
+
+def _sorted_remove(arr: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Removes `values` (one occurrence each) from the sorted array `arr`."""
+    values = np.sort(values)
+    # equal values: k-th copy removes the k-th equal element of `arr`
+    rank = np.arange(len(values)) - np.searchsorted(values, values, side="left")
+    return np.delete(arr, np.searchsorted(arr, values, side="left") + rank)
+
+
+def _sorted_insert(arr: np.ndarray, values: np.ndarray) -> np.ndarray:
+    """Inserts `values` into the sorted array `arr`, keeping it sorted."""
+    values = np.sort(values)
+    return np.insert(arr, np.searchsorted(arr, values), values)
+
+
+def _sorted_quantile(arr: np.ndarray, q: float) -> float:
+    """Quantile of a sorted array, same linear interpolation as `pd.Series.quantile`."""
+    if len(arr) == 0:
+        return np.nan
+    pos = q * (len(arr) - 1)
+    lo = int(np.floor(pos))
+    return float(np.quantile(arr[lo:lo + 2], pos - lo)) if lo + 1 < len(arr) else float(arr[lo])
+
+
+# "update_metrics" function to add new or changed movies to an existing metrics file
+def update_metrics(new_rows: pd.DataFrame, path: str = str(metrics_path)) -> pd.DataFrame:
+    """Incremental version of `add_metrics` for new releases and corrected rows.
+    The function:
+        - computes profit and ROI only for `new_rows`
+        - replaces rows with the same (title, year) in place, appends the others
+        - updates the 75th-percentile thresholds, overall and per genre/decade, from
+          sorted rating/ROI arrays (kept in `<name>.sorted.npz`) by insertion/removal
+          instead of a full sort or a groupby over the dataset
+        - re-flags `hit` only for rows whose classification changes
+        - refreshes the `HitThresholds` registry next to the file
+        - appends the new rows to the CSV when no existing row changed,
+          otherwise rewrites it.
+    The Parquet and Arrow copies are always rewritten in full (neither format can be
+    appended to in place), and the file is read once: that I/O still grows with the
+    size of the dataset, the threshold updates only with the number of new rows.
+    The result is the same as running `add_metrics` on the updated dataset.
+    Args:
+        new_rows (pd.DataFrame): Cleaned rows (output of `clean`) to add or replace.
+        path (str): Path to the metrics CSV file.
+    Returns:
+        pd.DataFrame: The updated metrics dataframe.
+    """
+    csv_path = Path(path)
+    if not csv_path.exists():
+        return add_metrics(new_rows, path=path)
+
+    d = read_metrics(csv_path)
+    d = d.astype({c: object for c in d.select_dtypes("category").columns})
+    sorted_values = _load_sorted_values(csv_path, d)
+
+    new = new_rows.copy()
+    new["profit"] = new["income_num"] - new["budget_num"]
+    new["roi"] = (new["income_num"] - new["budget_num"]) / new["budget_num"]
+    new["hit"] = False
+    new = new.reindex(columns=d.columns)
+
+    # Rows with a (title, year) already in the dataset are replaced in place
+    keys = pd.MultiIndex.from_frame(d[["title", "year"]].astype({"year": "float64"}))
+    new_keys = pd.MultiIndex.from_frame(new[["title", "year"]].astype({"year": "float64"}))
+    position = pd.Series(np.arange(len(d)), index=keys)
+    is_replacement = new_keys.isin(keys)
+    replaced = position.loc[new_keys[is_replacement]].to_numpy()
+
+    for c in ["rating", "roi"]:
+        old_values = d[c].to_numpy(dtype="float64")[replaced]
+        sorted_values[c] = _sorted_remove(sorted_values[c], old_values[~np.isnan(old_values)])
+        new_values = new[c].to_numpy(dtype="float64")
+        sorted_values[c] = _sorted_insert(sorted_values[c], new_values[~np.isnan(new_values)])
+    _update_group_values(sorted_values, d.iloc[replaced], insert=False)
+    _update_group_values(sorted_values, new, insert=True)
+
+    n_old = len(d)
+    replacement = new[is_replacement].set_axis(d.index[replaced])
+    d.loc[replacement.index, replacement.columns] = replacement
+    d = pd.concat([d, new[~is_replacement]], ignore_index=True)
+
+    rating_cut = _sorted_quantile(sorted_values["rating"], 0.75)
+    roi_cut = _sorted_quantile(sorted_values["roi"], 0.75)
+    hit = (d["rating"] >= rating_cut) & (d["roi"] >= roi_cut)
+    flipped = hit != d["hit"]
+    d.loc[flipped, "hit"] = hit[flipped]
+
+    n_changed = int(flipped.iloc[:n_old].sum()) + len(replaced)
+    print(f"Updating metrics: {int((~is_replacement).sum())} new rows, {len(replaced)} replaced, "
+          f"{int(flipped.iloc[:n_old].sum())} hit flags changed")
+
+    if n_changed == 0:
+        d.iloc[n_old:].to_csv(csv_path, mode="a", header=False, index=False)
+        _save_columnar(d, csv_path)
+    else:
+        save_clean(d, path=str(csv_path))
+    np.savez(_sorted_values_path(csv_path), n_rows=len(d), **sorted_values)
+    HitThresholds(
+        overall={"rating": rating_cut, "roi": roi_cut},
+        by_genre=_group_cuts(sorted_values, "genre_main", 0.75),
+        by_decade=_group_cuts(sorted_values, "decade", 0.75),
+        q=0.75,
+        version=HitThresholds.version_of(d),
+    ).save(csv_path)
+
+    print(f"Saved cleaned and enriched dataset to: {csv_path}")
+    return _encode_categories(d)
+
+
+# "build_title_index" function for fast title lookups
+def build_title_index(data: pd.DataFrame) -> dict[str, np.ndarray]:
+    """Builds a hash map from normalized (lower-case) title to row positions.
+    Titles are lower-cased once here, so each lookup is a dictionary access
+    instead of a scan over the whole column. Titles shared by several movies
+    (e.g. remakes from different years) map to all their positions.
+    Args:
+        data (pd.DataFrame): Dataframe containing a 'title' column.
+    Returns:
+        dict[str, np.ndarray]: Normalized title -> sorted row positions (for `iloc`).
+    """
+    keys = data["title"].str.lower()
+    return keys.groupby(keys.to_numpy(), sort=False).indices
+
+
 # "find_movie" function to find a movie by title
-def find_movie(title, data) -> pd.DataFrame | None:
+def find_movie(title, data, index: dict[str, np.ndarray] | None = None) -> pd.DataFrame | None:
     """Searches for a movie by exact title (case-insensitive).
     Args:
         title (str): Movie title to search for.
         data (pd.DataFrame): Dataframe containing a 'title' column.
+        index (dict | None): Index from `build_title_index(data)`; if None the
+            'title' column is scanned.
     Returns:
         pd.DataFrame | None: Matching rows if found, otherwise None.
     """
+    if index is not None:
+        positions = index.get(title.lower())
+        return data.iloc[positions] if positions is not None else None
+
     match = data[data["title"].str.lower() == title.lower()]
     return match if not match.empty else None
 
 
+# "downsample" function to reduce the points of a scatter plot
+def downsample(data: pd.DataFrame, n: int, by: list[str] | None = None,
+               random_state: int = 0) -> pd.DataFrame:
+    """Random sample of `n` rows, stratified by `by` (e.g. genre and hit): each group
+    keeps its share of the rows (largest remainder rounding), so the density of the
+    plot is preserved while the number of points stays bounded.
+    Args:
+        data (pd.DataFrame): Rows to sample.
+        n (int): Number of rows to keep.
+        by (list[str] | None): Stratification columns; None for a plain random sample.
+        random_state (int): Seed of the sample.
+    Returns:
+        pd.DataFrame: At most `n` rows, in their original order.
+    """
+    if len(data) <= n:
+        return data
+    by = [c for c in (by or []) if c in data.columns]
+    if not by:
+        return data.sample(n=n, random_state=random_state).sort_index()
+
+    # group of each row and quota of each group
+    codes = data.groupby(by, observed=True, dropna=False, sort=False).ngroup().to_numpy()
+    sizes = np.bincount(codes)
+    exact = n * sizes / len(data)
+    quota = np.floor(exact).astype(np.int64)
+    remainder = np.argsort(-(exact - quota), kind="stable")[:n - quota.sum()]
+    quota[remainder] += 1
+
+    # shuffle, then keep the first `quota` rows met in each group
+    order = np.random.default_rng(random_state).permutation(len(data))
+    rank = pd.Series(codes[order]).groupby(codes[order]).cumcount().to_numpy()
+    keep = np.sort(order[rank < quota[codes[order]]])
+    return data.iloc[keep]
+
+
+# "bin_2d" function to turn a large scatter plot into a heatmap
+def bin_2d(data: pd.DataFrame, x: str, y: str, bins: int = 50,
+           x_range: tuple[float, float] | None = None, log: bool = False) -> pd.DataFrame:
+    """Counts the rows in a `bins` × `bins` grid of (x, y): the heatmap has at most
+    bins² cells whatever the number of rows.
+    Args:
+        data (pd.DataFrame): Rows to bin.
+        x (str), y (str): Columns on the two axes.
+        bins (int): Number of bins per axis.
+        x_range (tuple | None): Limits of the x axis (e.g. trimming bounds); values
+            outside are left out. Defaults to the range of the data.
+        log (bool): Logarithmic bins on both axes (positive values only).
+    Returns:
+        pd.DataFrame: Non-empty cells with columns x, x2, y, y2 (cell edges) and count.
+    """
+    xs = data[x].to_numpy(dtype="float64", na_value=np.nan)
+    ys = data[y].to_numpy(dtype="float64", na_value=np.nan)
+    keep = np.isfinite(xs) & np.isfinite(ys)
+    if log:
+        keep &= (xs > 0) & (ys > 0)
+    if x_range is not None:
+        keep &= (xs >= x_range[0]) & (xs <= x_range[1])
+    xs, ys = xs[keep], ys[keep]
+    if len(xs) == 0:
+        return pd.DataFrame(columns=["x", "x2", "y", "y2", "count"])
+
+    if log:
+        xs, ys = np.log10(xs), np.log10(ys)
+    counts, x_edges, y_edges = np.histogram2d(xs, ys, bins=bins)
+    if log:
+        x_edges, y_edges = 10 ** x_edges, 10 ** y_edges
+
+    i, j = np.nonzero(counts)
+    return pd.DataFrame({
+        "x": x_edges[i], "x2": x_edges[i + 1],
+        "y": y_edges[j], "y2": y_edges[j + 1],
+        "count": counts[i, j].astype(np.int64),
+    })
+
+
+# "histogram" function to bin a column before charting it
+def histogram(values, bins: int, value_range: tuple[float, float] | None = None) -> pd.DataFrame:
+    """Counts the values in `bins` equal-width bins, so a histogram chart only needs
+    the bin edges and counts instead of the raw values.
+    Args:
+        values (array-like): Values to bin (missing and infinite values are left out).
+        bins (int): Number of bins.
+        value_range (tuple | None): Limits of the bins (e.g. trimming bounds); values
+            outside are left out. Defaults to the range of the values.
+    Returns:
+        pd.DataFrame: One row per bin with columns start, end and count.
+    """
+    values = np.asarray(values, dtype="float64")
+    values = values[np.isfinite(values)]
+    if value_range is not None:
+        values = values[(values >= value_range[0]) & (values <= value_range[1])]
+    counts, edges = np.histogram(values, bins=bins, range=value_range)
+    return pd.DataFrame({"start": edges[:-1], "end": edges[1:], "count": counts})
+
+
 # "ask_float" function to recognize different numeric formats 
 def ask_float(prompt) -> float:
     """Asks the user for a numeric input and parses common formats.
@@ -268,8 +1042,116 @@ def ask_float(prompt) -> float:
             
 
 output_dir = Path("outputs/figures")
-output_dir.mkdir(parents=True, exist_ok=True)
 
-def save_fig(fig, name: str):
-    """Saves a figure (graph) into the output folder."""
-    fig.savefig(output_dir / f"{name}.png", dpi=300, bbox_inches="tight")
\ No newline at end of file
+@timed()
+def save_fig(fig, name: str, key: str | None = None):
+    """Saves a figure (graph) into the output folder.
+    If a render `key` is given (see `MoviePlotter.render_key`), it is stored in
+    `outputs/figures/.cache/<name>.key`, so the figure is not re-rendered until
+    its inputs, arguments or style change.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    fig.savefig(output_dir / f"{name}.png", dpi=300, bbox_inches="tight")
+    if key is not None:
+        (output_dir / ".cache").mkdir(exist_ok=True)
+        (output_dir / ".cache" / f"{name}.key").write_text(key)
+
+
+def figure_is_current(name: str, key: str) -> bool:
+    """True if `name.png` exists and was saved with the same render key."""
+    key_path = output_dir / ".cache" / f"{name}.key"
+    return ((output_dir / f"{name}.png").exists() and key_path.exists()
+            and key_path.read_text() == key)
+
+
+# Batch of figures saved by main.py: (file name, MoviePlotter method, args, kwargs)
+figure_specs = [
+    ("dist_rating", "dist", ("rating",), {}),
+    ("dist_roi", "dist", ("roi",), {}),
+    ("dist_profit", "dist", ("profit",), {}),
+    ("scatter_budget_income", "scatter", ("budget_num", "income_num"), {"log": True}),
+    ("boxplot_roi_by_genre", "box_by_genre", ("roi",), {}),
+    ("boxplot_rating_by_genre", "box_by_genre", ("rating",), {}),
+    ("boxplot_runtime_by_genre", "box_by_genre", ("runtime_min",), {}),
+    ("roi_vs_rating", "roi_vs_rating", (), {}),
+    ("correlation_heatmap", "corr_heatmap", (), {}),
+    ("hit_trend_over_time", "hit_trend_over_time", (), {}),
+    ("hit_by_runtime_bucket", "hit_by_runtime_bucket", (), {}),
+]
+
+_worker_plotter = None
+
+def _init_render_worker(df, thresholds, agg: bool = True) -> None:
+    """Sets up a rendering process: non-interactive backend and one MoviePlotter."""
+    global _worker_plotter
+    if agg:
+        import matplotlib.pyplot as plt
+        plt.switch_backend("Agg")
+    from src.models import MoviePlotter
+    _worker_plotter = MoviePlotter(df, thresholds)
+
+
+def _render_one(spec) -> tuple[str, float, list]:
+    """Renders and saves one figure of `figure_specs`.
+    Returns (name, seconds, profiling records): a forked worker inherits the active
+    Profiler, and its stage records are handed back to the parent this way.
+    """
+    import matplotlib.pyplot as plt
+    name, method, args, kwargs, key = spec
+    prof = current_profiler()
+    n_records = len(prof.records) if prof else 0
+    start = time.perf_counter()
+    with stage(name):
+        fig, _ = getattr(_worker_plotter, method)(*args, show=False, **kwargs)
+        save_fig(fig, name, key=key)
+        plt.close(fig)
+    return name, time.perf_counter() - start, prof.records[n_records:] if prof else []
+
+
+# "render_figures" function to render the batch of figures in parallel
+@timed(rows=lambda df, *a, **k: len(df))
+def render_figures(df, specs=figure_specs, workers: int | None = None, thresholds=None,
+                   use_cache: bool = True) -> dict[str, float | None]:
+    """Renders independent figures in a process pool (Agg backend) and saves them as PNG.
+    Each worker builds its own MoviePlotter once, so every figure gets the same
+    theme as a serial run and the output files are the same.
+    With `use_cache`, figures whose render key (input columns, method, arguments,
+    style) matches the one saved with the existing PNG are skipped.
+    Args:
+        df (pd.DataFrame): Metrics dataset.
+        specs (list): (file name, MoviePlotter method, args, kwargs) of each figure.
+        workers (int | None): Number of processes (None = one per CPU, 1 = no pool).
+        thresholds (HitThresholds | None): Hit thresholds passed to MoviePlotter.
+        use_cache (bool): Whether to skip figures that are already up to date.
+    Returns:
+        dict[str, float | None]: Render time (seconds) per figure name (None for figures
+        skipped as up to date).
+    """
+    from src.models import MoviePlotter
+    plotter = MoviePlotter(df, thresholds)
+    keyed = [(name, method, args, kwargs, plotter.render_key(method, *args, **kwargs))
+             for name, method, args, kwargs in specs]
+    cached = [s[0] for s in keyed if use_cache and figure_is_current(s[0], s[4])]
+    todo = [s for s in keyed if s[0] not in cached]
+
+    workers = workers or min(len(todo), os.cpu_count() or 1)
+    if not todo:
+        results = []
+    elif workers == 1:
+        _init_render_worker(df, thresholds, agg=False)  # keep the caller's backend
+        results = list(map(_render_one, todo))
+    else:
+        # fork where available: the data is inherited instead of pickled for every worker
+        method = "fork" if "fork" in mp.get_all_start_methods() else "spawn"
+        with ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context(method),
+                                 initializer=_init_render_worker, initargs=(df, thresholds)) as pool:
+            results = list(pool.map(_render_one, todo))
+        if current_profiler():
+            current_profiler().records.extend(r for _, _, records in results for r in records)
+
+    timings = {name: seconds for name, seconds, _ in results}
+    for name, seconds in timings.items():
+        print(f"  {name}: {seconds:.2f}s")
+    if cached:
+        print(f"  {len(cached)} figures unchanged, not re-rendered: {', '.join(cached)}")
+    return {**{name: None for name in cached}, **timings}
\ No newline at end of file
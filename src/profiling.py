@@ -0,0 +1,153 @@
+#PROFILING
+import cProfile
+import functools
+import json
+import os
+import sys
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+_active = None  # Profiler of the current run (None = instrumentation off)
+
+
+# Class collecting the timings of one pipeline run
+class Profiler:
+    """Records wall time, rows, rows/s and peak memory of every instrumented stage
+    (see `stage` and `timed`) while it is active, and writes them as a JSON report.
+    Stages nest: a stage entered inside another one is recorded as "parent/child".
+    When instrumentation is off (no active Profiler) stages cost a single check.
+
+    Attributes:
+        memory (bool): Whether to trace peak memory per stage (tracemalloc, slower).
+        cprofile (str | None): Name of a stage to run under cProfile (e.g. "clean").
+        output_dir (Path): Folder of the JSON report and of the cProfile dump.
+        records (list[dict]): One record per finished stage, in completion order.
+    """
+    def __init__(self, memory: bool = True, cprofile: str | None = None,
+                 output_dir: str = "outputs/profiles"):
+        self.memory = memory
+        self.cprofile = cprofile
+        self.output_dir = Path(output_dir)
+        self.records = []
+        self.started = datetime.now()
+        self._stack = []  # open stages: [path, peak of finished children]
+        self._n_dumps = 0  # cProfile dumps written by this process
+        self._pid = os.getpid()
+        self._started_tracing = False  # tracemalloc started by this Profiler (not by the caller)
+
+    def __enter__(self):
+        global _active
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        _active = self
+        return self
+
+    def __exit__(self, *exc):
+        global _active
+        _active = None
+        if self._started_tracing:
+            tracemalloc.stop()
+            self._started_tracing = False
+        return False
+
+    # Report of the run as a dict
+    def report(self) -> dict:
+        try:
+            import resource  # Unix only
+            peak_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+            peak_rss = round(peak_rss / (1024 if sys.platform != "darwin" else 1024 ** 2), 1)
+        except ImportError:
+            peak_rss = None
+        return {
+            "started": self.started.isoformat(timespec="seconds"),
+            "python": sys.version.split()[0],
+            "peak_rss_mb": peak_rss,
+            "stages": self.records,
+        }
+
+    # Write the report to `output_dir/run-<timestamp>.json`
+    def save(self, path: str | None = None) -> Path:
+        path = Path(path) if path else self.output_dir / f"run-{self.started:%Y%m%d-%H%M%S}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(), indent=2))
+        return path
+
+
+def current_profiler() -> Profiler | None:
+    """Profiler of the current run, None when instrumentation is off."""
+    return _active
+
+
+@contextmanager
+def stage(name: str, rows: int | None = None):
+    """Times the enclosed block as a pipeline stage of the active Profiler.
+    Args:
+        name (str): Stage name (nested stages are recorded as "parent/name").
+        rows (int | None): Number of rows processed, for rows/s.
+    """
+    prof = _active
+    if prof is None:
+        yield
+        return
+
+    path = "/".join([s[0] for s in prof._stack] + [name])
+    if prof.memory:
+        _, peak = tracemalloc.get_traced_memory()
+        if prof._stack:  # keep the parent's peak before resetting it
+            prof._stack[-1][1] = max(prof._stack[-1][1], peak)
+        tracemalloc.reset_peak()
+        start_mem = tracemalloc.get_traced_memory()[0]
+    prof._stack.append([name, 0])
+
+    profile = cProfile.Profile() if name == prof.cprofile else None
+    start = time.perf_counter()
+    try:
+        if profile is not None:
+            profile.enable()
+        yield
+    finally:
+        if profile is not None:
+            profile.disable()
+        wall = time.perf_counter() - start
+        _, child_peak = prof._stack.pop()
+
+        record = {"stage": path, "wall_s": round(wall, 6), "rows": rows,
+                  "rows_per_s": round(rows / wall, 1) if rows and wall > 0 else None}
+        if prof.memory:
+            _, peak = tracemalloc.get_traced_memory()
+            peak = max(peak, child_peak)
+            record["peak_mem_mb"] = round((peak - start_mem) / 2 ** 20, 3)
+            if prof._stack:
+                prof._stack[-1][1] = max(prof._stack[-1][1], peak)
+            tracemalloc.reset_peak()
+        if profile is not None:
+            prof.output_dir.mkdir(parents=True, exist_ok=True)
+            # one file per call: a stage can run several times per run, and in forked workers
+            prof._n_dumps += 1
+            worker = f"-{os.getpid()}" if os.getpid() != prof._pid else ""
+            dump = prof.output_dir / f"{name}-{prof.started:%Y%m%d-%H%M%S}{worker}-{prof._n_dumps}.prof"
+            profile.dump_stats(dump)
+            record["cprofile"] = str(dump)
+        prof.records.append(record)
+
+
+def timed(name: str | None = None, rows=None):
+    """Decorator version of `stage`.
+    Args:
+        name (str | None): Stage name (defaults to the function name).
+        rows (callable | None): Called with the function arguments, returns the number
+            of rows processed (e.g. `lambda df, *a, **k: len(df)`).
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _active is None:
+                return func(*args, **kwargs)
+            with stage(name or func.__name__, rows=rows(*args, **kwargs) if rows else None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,114 @@
+#SEARCH
+import bisect
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+
+def _normalize(text) -> str:
+    """Case-folds a string, strips accents ("Amélie" -> "amelie") and keeps only
+    letters/digits (any script) separated by single spaces."""
+    text = unicodedata.normalize("NFKD", str(text)).casefold()
+    text = "".join(c if c.isalnum() else " " for c in text if not unicodedata.combining(c))
+    return " ".join(text.split())
+
+
+def _trigrams(key: str) -> set[str]:
+    """Returns the set of character trigrams of a normalized string (padded with spaces)."""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# Class for prefix and typo-tolerant search over a text column
+class SearchIndex:
+    """A search index over the distinct values of a text column (e.g. titles).
+    It supports:
+        - prefix autocomplete (binary search over the sorted normalized values)
+        - typo-tolerant ranked matching (trigram inverted index).
+    The index is built once per dataset version; queries never scan the column.
+
+    Attributes:
+        labels (list[str]): Original spelling of each distinct value.
+        keys (list[str]): Normalized version of each distinct value (distinct values
+            may share a key, e.g. "Tar" and "Tár"; values with an empty key are left out).
+        max_postings (int): Maximum number of postings read per fuzzy query.
+    """
+    def __init__(self, values, max_postings: int = 20_000):
+        values = pd.Series(values).dropna().astype(str).drop_duplicates()
+        keys = values.map(_normalize)
+        indexed = (keys != "").to_numpy()
+        self.labels = values[indexed].tolist()
+        self.keys = keys[indexed].tolist()
+        self.max_postings = max_postings
+
+        # Prefix: normalized values in sorted order
+        order = sorted(range(len(self.keys)), key=self.keys.__getitem__)
+        self._sorted_keys = [self.keys[i] for i in order]
+        self._sorted_ids = np.array(order, dtype=np.int64)
+
+        # Fuzzy: trigram -> ids of the values containing it (CSR layout)
+        self._gram_ids = {}
+        gram_col, value_col = [], []
+        self._n_grams = np.zeros(len(self.keys), dtype=np.int64)
+        for i, key in enumerate(self.keys):
+            grams = _trigrams(key)
+            self._n_grams[i] = len(grams)
+            for g in grams:
+                gram_col.append(self._gram_ids.setdefault(g, len(self._gram_ids)))
+                value_col.append(i)
+
+        gram_col = np.array(gram_col, dtype=np.int64)
+        order = np.argsort(gram_col, kind="stable")
+        self._postings = np.array(value_col, dtype=np.int64)[order]
+        self._offsets = np.searchsorted(gram_col[order], np.arange(len(self._gram_ids) + 1))
+
+    # Values starting with the query
+    def prefix(self, query: str, k: int = 10) -> list[str]:
+        key = _normalize(query)
+        if not key:
+            return []
+        lo = bisect.bisect_left(self._sorted_keys, key)
+        hi = bisect.bisect_left(self._sorted_keys, key[:-1] + chr(ord(key[-1]) + 1))
+        return [self.labels[i] for i in self._sorted_ids[lo:min(hi, lo + k)]]
+
+    # Values sharing most trigrams with the query (ranked)
+    def fuzzy(self, query: str, k: int = 10, min_score: float = 0.3) -> list[str]:
+        key = _normalize(query)
+        grams = [self._gram_ids[g] for g in _trigrams(key) if g in self._gram_ids] if key else []
+        if not grams:
+            return []
+        n_query = len(_trigrams(key))
+
+        # Rarest trigrams first, within the postings budget (common ones add little)
+        lists = sorted((self._postings[self._offsets[g]:self._offsets[g + 1]] for g in grams), key=len)
+        used, total = [], 0
+        for postings in lists:
+            if used and total + len(postings) > self.max_postings:
+                break
+            used.append(postings)
+            total += len(postings)
+
+        ids, shared = np.unique(np.concatenate(used), return_counts=True)
+        n_value = self._n_grams[ids]
+        # share of the (considered) query trigrams found in the value, minus a penalty
+        # for length mismatch; trigrams unknown to the index count as misses
+        n_considered = n_query - (len(lists) - len(used))
+        score = shared / n_considered - 0.5 * np.abs(n_value - n_query) / (n_value + n_query)
+
+        keep = score >= min_score
+        ids, score = ids[keep], score[keep]
+        if len(ids) > k:
+            top = np.argpartition(-score, k)[:k]
+            ids, score = ids[top], score[top]
+        return [self.labels[i] for i in ids[np.argsort(-score, kind="stable")]]
+
+    # Autocomplete suggestions: prefix matches first, then fuzzy matches
+    def suggest(self, query: str, k: int = 10) -> list[str]:
+        out = self.prefix(query, k)
+        for label in self.fuzzy(query, k):
+            if len(out) >= k:
+                break
+            if label not in out:
+                out.append(label)
+        return out
@@ -0,0 +1,103 @@
+#QUANTILE SKETCH
+import numpy as np
+
+
+# Class for approximate, mergeable quantiles of a numeric column
+class QuantileSketch:
+    """A mergeable quantile sketch (compactor hierarchy, as in KLL/MRL sketches).
+    Values are kept in levels: an item at level h stands for 2**h original values.
+    When a level holds more than `k` items it is sorted and every other item
+    (random offset) is promoted to the next level, so memory stays O(k log(n/k)).
+    The rank error of a quantile is at most about log2(n/k)/k of n; while n <= k
+    nothing is compacted and quantiles are exact (same linear interpolation as
+    `pd.Series.quantile`).
+
+    Attributes:
+        k (int): Maximum number of items per level.
+        n (int): Number of values added (NaN are skipped).
+        levels (list[np.ndarray]): Items of each level.
+    """
+    def __init__(self, k: int = 4096, seed: int = 0):
+        self.k = k
+        self.n = 0
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(seed)
+        self._sorted = None
+
+    # Build a sketch from an array-like of values
+    @staticmethod
+    def from_values(values, k: int = 4096) -> "QuantileSketch":
+        sketch = QuantileSketch(k=k)
+        sketch.update(values)
+        return sketch
+
+    # Add values (e.g. one chunk of a large file)
+    def update(self, values) -> None:
+        values = np.asarray(values, dtype="float64")
+        values = values[~np.isnan(values)]
+        self.levels[0] = np.concatenate([self.levels[0], values])
+        self.n += len(values)
+        self._compress()
+
+    # Combine with a sketch built on other data (e.g. another chunk)
+    def merge(self, other: "QuantileSketch") -> None:
+        for h, items in enumerate(other.levels):
+            if h == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[h] = np.concatenate([self.levels[h], items])
+        self.n += other.n
+        self._compress()
+
+    def _compress(self) -> None:
+        self._sorted = None
+        h = 0
+        while h < len(self.levels):
+            if len(self.levels[h]) > self.k:
+                items = np.sort(self.levels[h])
+                # an odd item out stays at this level, so the total weight is unchanged
+                cut = len(items) - len(items) % 2
+                keep, items = items[cut:], items[:cut]
+                promoted = items[self._rng.integers(2)::2]
+                if h + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[h] = keep
+                self.levels[h + 1] = np.concatenate([self.levels[h + 1], promoted])
+            h += 1
+
+    # q-th quantile (0 <= q <= 1), NaN if the sketch is empty
+    def quantile(self, q: float) -> float:
+        if self.n == 0:
+            return np.nan
+        if self._sorted is None:
+            items = np.concatenate(self.levels)
+            weights = np.concatenate([np.full(len(l), 2 ** h, dtype=np.int64) for h, l in enumerate(self.levels)])
+            order = np.argsort(items, kind="stable")
+            self._sorted = (items[order], np.cumsum(weights[order]))
+        items, cum = self._sorted
+
+        # linear interpolation between the values of rank floor(pos) and floor(pos) + 1
+        pos = q * (cum[-1] - 1)
+        lo = int(np.floor(pos))
+        a = items[np.searchsorted(cum, lo, side="right")]
+        b = items[np.searchsorted(cum, min(lo + 1, cum[-1] - 1), side="right")]
+        return float(np.quantile(np.array([a, b]), pos - lo))
+
+    # New sketch combining several sketches (e.g. the cells selected by a filter)
+    @staticmethod
+    def merged(sketches, k: int = 4096) -> "QuantileSketch":
+        out = QuantileSketch(k=k)
+        for sketch in sketches:
+            out.merge(sketch)
+        return out
+
+
+def sketches_by(df, column: str, by: list[str], k: int = 4096) -> dict:
+    """Builds one sketch of `column` per group of `by`, so that the quantiles of any
+    union of groups (a filter state) come from merging sketches instead of the rows.
+
+    Returns:
+        dict: Group key (tuple) -> QuantileSketch.
+    """
+    groups = df.groupby(by, observed=True, dropna=False)[column]
+    return {key if isinstance(key, tuple) else (key,): QuantileSketch.from_values(values, k=k)
+            for key, values in groups}